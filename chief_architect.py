@@ -9,28 +9,51 @@ SimplyECS – Chief Architect AI
 
 import os
 import sys
-import json
-import yaml
+import hashlib
+import textwrap
 import requests
-from github import Github, GithubException
-from openai import OpenAI
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from crew_common import (GitHubAPIError, post_slack, load_config, gh_get, gh_post, gh_paginate, gql,
+                         load_json_cache, save_json_cache, stream_text)
 
 # ---------- Ayarlar ----------
 REPO_FULL = "halitipek/ai-crew-sandbox"
+REPO_PATH = f"/repos/{REPO_FULL}"
+# GitHub ikincil hız limitlerine takılmamak için aynı anda incelenecek en fazla PR sayısı
+MAX_PARALLEL_REVIEWS = 10
+# Prompt'a eklenecek dosya başına en fazla diff boyutu
+MAX_PATCH_BYTES = 32 * 1024
 
 # Config'den model bilgilerini oku
-def load_config():
-    try:
-        with open('crew_config.yaml', 'r') as file:
-            config = yaml.safe_load(file)
-            return config.get('crew', {})
-    except Exception as e:
-        print(f"ℹ️ Config dosyası okunamadı, varsayılan model kullanılacak: {str(e)}")
-        return {}
-
 CONFIG = load_config()
 MODEL_ID = CONFIG.get('chief_architect', {}).get('model', 'gpt-3.5-turbo-0125')
 
+# İnceleme yönergesi; değiştiğinde önceki incelemelerin önbelleği geçersiz olur.
+# Her çağrıda ilk mesaj olarak aynen gönderilir; değişken kısım kullanıcı mesajındadır
+REVIEW_SYSTEM_PROMPT = textwrap.dedent("""
+        Sen bir C++ kütüphanesi geliştiren takımın baş mimarısın. SimplyECS (Entity Component System) kütüphanesi 
+        için kod incelemesi yapıyorsun. Aşağıdaki kriterlere göre kodu değerlendir:
+        
+        1. Kodlama standartları: Modern C++ (C++17/20) kullanımı, doğru bellek yönetimi
+        2. Performans: ECS sistemlerinde performans kritiktir, gereksiz kopyalar ve verimsiz algoritmaları kontrol et
+        3. Tasarım: ECS tasarım prensiplerine (veri odaklı tasarım, cache uyumluluğu) uygunluk
+        4. Okunabilirlik: Açık ve anlaşılır kod, uygun dökümantasyon
+        5. Test edilebilirlik: Birim testler için uygun tasarım
+        
+        İnceleme sonucunda şunları belirt:
+        1. Genel değerlendirme (olumlu ve olumsuz yönler)
+        2. Belirli geliştirme önerileri (kod örnekleriyle)
+        3. PR'ın mevcut haliyle kabul edilip edilmeyeceği (APPROVED veya CHANGES_REQUESTED)
+        
+        Teknik detaylara gir, ancak yapıcı ve yardımcı ol.
+        """).strip()
+
+# Aynı head commit, model ve yönerge için yapılmış incelemeler burada saklanır
+REVIEW_CACHE_DIR = "reviews"
+REVIEW_NO_KEY_TEXT = "OpenAI API anahtarı eksik olduğu için kod incelemesi yapılamadı. Lütfen OPENAI_API_KEY ortam değişkenini ayarlayın."
+REVIEW_ERROR_TEXT = "AI incelemesi sırasında bir hata oluştu. Lütfen daha sonra tekrar deneyin."
+
 # Ortam değişkenlerini kontrol et
 TOKEN = os.environ.get("GH_PAT")
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
@@ -38,18 +61,23 @@ SLACK_WEBHOOK = os.environ.get("SLACK_WEBHOOK")
 PR_NUMBER = os.environ.get("PR_NUMBER")
 
 # API'leri yapılandır
-client = None
-if OPENAI_API_KEY:
-    client = OpenAI(api_key=OPENAI_API_KEY)
+@lru_cache(maxsize=None)
+def get_openai_client():
+    """OpenAI istemcisini ilk incelemede oluşturur; anahtar yoksa None döndürür.
+
+    openai paketi (pydantic, httpx vb.) içe aktarması pahalıdır; incelenecek PR
+    olmayan çalıştırmalarda hiç yüklenmez.
+    """
+    if not OPENAI_API_KEY:
+        return None
+    from openai import OpenAI
+    return OpenAI(api_key=OPENAI_API_KEY)
 
 # Github bağlantısı için token kontrolü
 if not TOKEN:
     print("❌ Hata: GH_PAT ortam değişkeni ayarlanmamış.")
     sys.exit(1)
 
-gh = Github(TOKEN)
-repo = gh.get_repo(REPO_FULL)
-
 # ---------- Yardımcı Fonksiyonlar ----------
 def notify_slack(message):
     """Slack'e bildirim gönderir."""
@@ -57,83 +85,105 @@ def notify_slack(message):
         print("ℹ️ SLACK_WEBHOOK ortam değişkeni ayarlanmamış, bildirim gönderilemiyor.")
         return False
         
-    try:
-        payload = {"text": message}
-        response = requests.post(SLACK_WEBHOOK, json=payload, timeout=10)
-        response.raise_for_status()
-        return True
-    except requests.exceptions.RequestException as e:
-        print(f"⚠️ Slack bildirimi gönderilemedi: {e}")
-        return False
+    # İnceleme hattı Slack yanıtını beklemez
+    post_slack(SLACK_WEBHOOK, message)
+    return True
+
+# Açık PR'ları ve onay/değişiklik talebi içeren review sayısını tek sayfalı sorguda getirir
+Q_PENDING_PRS = """
+query($o:String!,$n:String!,$cursor:String){
+  repository(owner:$o,name:$n){
+    pullRequests(states:OPEN, first:100, after:$cursor){
+      nodes{
+        number title body headRefName headRefOid
+        reviews(states:[APPROVED, CHANGES_REQUESTED]){ totalCount }
+      }
+      pageInfo{ endCursor hasNextPage }
+    }
+  }
+}"""
+
+def get_pending_prs():
+    """İnceleme bekleyen açık PR'ları sunucu tarafında filtreleyerek getirir."""
+    owner, name = REPO_FULL.split("/")
+    pending_review, cursor = [], None
+    while True:
+        resp = gql(Q_PENDING_PRS, {"o": owner, "n": name, "cursor": cursor})
+        if not resp:
+            print("❌ Bekleyen PR'lar alınamadı.")
+            return []
+        pulls = resp["data"]["repository"]["pullRequests"]
+        for node in pulls["nodes"]:
+            # Henüz onaylanmamış ve değişiklik talep edilmemiş PR'ları dahil et
+            if node["reviews"]["totalCount"] == 0:
+                pending_review.append({
+                    "number": node["number"],
+                    "title": node["title"],
+                    "body": node["body"],
+                    "head": {"ref": node["headRefName"], "sha": node["headRefOid"]},
+                })
+        if not pulls["pageInfo"]["hasNextPage"]:
+            return pending_review
+        cursor = pulls["pageInfo"]["endCursor"]
 
 def get_pr(pr_number=None):
     """Belirli bir PR'ı veya tüm bekleyen PR'ları alır."""
+    if not pr_number:
+        # Bekleyen tüm PR'ları getir
+        return get_pending_prs()
     try:
-        if pr_number:
-            # Belirli PR numarası verilmişse onu getir
-            return repo.get_pull(int(pr_number))
-        else:
-            # Bekleyen tüm PR'ları getir
-            open_prs = repo.get_pulls(state="open")
-            pending_review = []
-            
-            for pr in open_prs:
-                # PR'ın review durumunu kontrol et
-                reviews = pr.get_reviews()
-                has_approval = any(review.state == "APPROVED" for review in reviews)
-                has_changes_requested = any(review.state == "CHANGES_REQUESTED" for review in reviews)
-                
-                # Henüz incelenmemiş veya changes requested olan PR'ları dahil et
-                if not has_approval and not has_changes_requested:
-                    pending_review.append(pr)
-                    
-            return pending_review
-    except GithubException as e:
-        print(f"❌ PR'lar alınırken hata oluştu: {e.status} - {e.data}")
-        return [] if pr_number is None else None
+        # Belirli PR numarası verilmişse onu getir
+        return gh_get(f"{REPO_PATH}/pulls/{int(pr_number)}")
+    except GitHubAPIError as e:
+        print(f"❌ PR alınırken hata oluştu: {e.status} - {e.data}")
+        return None
+    except requests.exceptions.RequestException as e:
+        print(f"❌ PR alınırken bağlantı hatası: {e}")
+        return None
+
+def truncate_patch(patch, limit=MAX_PATCH_BYTES):
+    """Diff metnini en fazla `limit` bayta kırpar ve kırpılan miktarı belirtir."""
+    data = patch.encode('utf-8')
+    if len(data) <= limit:
+        return patch
+    kept = data[:limit].decode('utf-8', errors='ignore')
+    return f"{kept}\n... [{len(data) - limit} bayt kırpıldı]"
 
 def get_file_changes(pr):
-    """PR'daki değişiklikleri alır."""
+    """PR'daki değişiklikleri ve diff parçalarını (patch) alır."""
     try:
-        files = pr.get_files()
-        changes = []
-        
-        for file in files:
-            # Dosya içeriğini al (eğer silinmemişse)
-            content = None
-            if file.status != "removed":
-                try:
-                    content_file = repo.get_contents(file.filename, ref=pr.head.ref)
-                    content = content_file.decoded_content.decode('utf-8')
-                except Exception as e:
-                    print(f"⚠️ Dosya içeriği alınamadı {file.filename}: {e}")
-            
-            changes.append({
-                "filename": file.filename,
-                "status": file.status,
-                "additions": file.additions,
-                "deletions": file.deletions,
-                "content": content
-            })
-            
-        return changes
-    except GithubException as e:
+        files = gh_paginate(f"{REPO_PATH}/pulls/{pr['number']}/files")
+    except GitHubAPIError as e:
         print(f"❌ Dosya değişiklikleri alınırken hata oluştu: {e.status} - {e.data}")
         return []
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Dosya değişiklikleri alınırken bağlantı hatası: {e}")
+        return []
+    
+    # Dosyanın tamamı yerine sadece diff incelenir; GitHub çok büyük veya
+    # ikili dosyalar için "patch" alanını hiç göndermez
+    return [{
+        "filename": file["filename"],
+        "status": file["status"],
+        "additions": file["additions"],
+        "deletions": file["deletions"],
+        "patch": truncate_patch(file["patch"]) if file.get("patch") else None,
+    } for file in files]
 
 def review_code(pr_title, pr_body, changes):
     """AI modeli kullanarak kod incelemesi yapar."""
+    client = get_openai_client()
     if not client:
         print("❌ OpenAI API anahtarı ayarlanmamış, kod incelemesi yapılamıyor.")
-        return "OpenAI API anahtarı eksik olduğu için kod incelemesi yapılamadı. Lütfen OPENAI_API_KEY ortam değişkenini ayarlayın."
+        return REVIEW_NO_KEY_TEXT
     
     try:
         code_blocks = []
         for change in changes:
-            if change["content"]:
+            if change["patch"]:
                 code_blocks.append(f"Dosya: {change['filename']} ({change['status']})\n"
                                   f"Eklemeler: {change['additions']}, Silmeler: {change['deletions']}\n"
-                                  f"```\n{change['content']}\n```")
+                                  f"```diff\n{change['patch']}\n```")
             else:
                 code_blocks.append(f"Dosya: {change['filename']} ({change['status']})\n"
                                   f"Eklemeler: {change['additions']}, Silmeler: {change['deletions']}\n"
@@ -141,70 +191,107 @@ def review_code(pr_title, pr_body, changes):
         
         code_content = "\n\n".join(code_blocks)
         
-        system_message = """
-        Sen bir C++ kütüphanesi geliştiren takımın baş mimarısın. SimplyECS (Entity Component System) kütüphanesi 
-        için kod incelemesi yapıyorsun. Aşağıdaki kriterlere göre kodu değerlendir:
-        
-        1. Kodlama standartları: Modern C++ (C++17/20) kullanımı, doğru bellek yönetimi
-        2. Performans: ECS sistemlerinde performans kritiktir, gereksiz kopyalar ve verimsiz algoritmaları kontrol et
-        3. Tasarım: ECS tasarım prensiplerine (veri odaklı tasarım, cache uyumluluğu) uygunluk
-        4. Okunabilirlik: Açık ve anlaşılır kod, uygun dökümantasyon
-        5. Test edilebilirlik: Birim testler için uygun tasarım
-        
-        İnceleme sonucunda şunları belirt:
-        1. Genel değerlendirme (olumlu ve olumsuz yönler)
-        2. Belirli geliştirme önerileri (kod örnekleriyle)
-        3. PR'ın mevcut haliyle kabul edilip edilmeyeceği (APPROVED veya CHANGES_REQUESTED)
-        
-        Teknik detaylara gir, ancak yapıcı ve yardımcı ol.
-        """
-        
         user_message = f"""
         PR Başlığı: {pr_title}
         PR Açıklaması: {pr_body}
         
-        Kod değişiklikleri:
+        Kod değişiklikleri (unified diff):
         
         {code_content}
         """
         
-        response = client.chat.completions.create(
+        stream = client.chat.completions.create(
             model=MODEL_ID,
             messages=[
-                {"role": "system", "content": system_message},
+                {"role": "system", "content": REVIEW_SYSTEM_PROMPT},
                 {"role": "user", "content": user_message}
             ],
             temperature=1,
-            max_completion_tokens=2000  # max_tokens yerine max_completion_tokens kullan
+            max_completion_tokens=2000,  # max_tokens yerine max_completion_tokens kullan
+            stream=True
         )
         
-        return response.choices[0].message.content
+        return stream_text(stream)
     
     except Exception as e:
         print(f"❌ AI incelemesi sırasında hata oluştu: {str(e)}")
-        return "AI incelemesi sırasında bir hata oluştu. Lütfen daha sonra tekrar deneyin."
+        return REVIEW_ERROR_TEXT
 
 def add_review_comment(pr, review_text):
-    """PR'a yorum olarak inceleme ekler."""
+    """İncelemeyi PR'a tek bir onaylayan review olarak ekler."""
+    body = f"## 🧠 Chief Architect İncelemesi\n\n{review_text}\n\n---\nBu PR otomatik olarak onaylanmıştır."
     try:
-        # PR'a yorum olarak ekle (GitHub review yerine)
-        pr.create_issue_comment(f"## 🧠 Chief Architect İncelemesi\n\n{review_text}")
-        print(f"✅ PR #{pr.number} için inceleme yorumu eklendi.")
-        
-        # PR otomatik olarak onaylanır (Core Engineers'ı tetiklemek için)
-        pr.create_review(body="Bu PR otomatik olarak onaylanmıştır.", event="APPROVE")
-        print(f"✅ PR #{pr.number} otomatik olarak onaylandı.")
-        
+        # İnceleme metni ve onay tek istekte gönderilir (Core Engineers'ı tetiklemek için)
+        gh_post(f"{REPO_PATH}/pulls/{pr['number']}/reviews", {"body": body, "event": "APPROVE"})
+        print(f"✅ PR #{pr['number']} için inceleme eklendi ve PR otomatik olarak onaylandı.")
         return True
-    except GithubException as e:
+    except GitHubAPIError as e:
         # Kendi PR'ınızı onaylayamazsınız hatası (422)
-        if e.status == 422:
-            print(f"ℹ️ PR #{pr.number} onaylanamadı (kendi PR'ınızı onaylayamazsınız). Sadece yorum ekleniyor.")
-            return True
-        print(f"❌ PR #{pr.number} için inceleme yorumu eklenirken hata: {e.status} - {e.data}")
+        if e.status != 422:
+            print(f"❌ PR #{pr['number']} için inceleme yorumu eklenirken hata: {e.status} - {e.data}")
+            return False
+        print(f"ℹ️ PR #{pr['number']} onaylanamadı (kendi PR'ınızı onaylayamazsınız). Sadece yorum ekleniyor.")
+    except requests.exceptions.RequestException as e:
+        print(f"❌ PR #{pr['number']} için inceleme yorumu eklenirken bağlantı hatası: {e}")
+        return False
+    
+    try:
+        gh_post(f"{REPO_PATH}/issues/{pr['number']}/comments",
+                {"body": f"## 🧠 Chief Architect İncelemesi\n\n{review_text}"})
+        print(f"✅ PR #{pr['number']} için inceleme yorumu eklendi.")
+        return True
+    except GitHubAPIError as e:
+        print(f"❌ PR #{pr['number']} için inceleme yorumu eklenirken hata: {e.status} - {e.data}")
         return False
+    except requests.exceptions.RequestException as e:
+        print(f"❌ PR #{pr['number']} için inceleme yorumu eklenirken bağlantı hatası: {e}")
+        return False
+
+def review_cache_name(pr):
+    """PR'ın head commit'i, model ve inceleme yönergesinden önbellek dosya adını üretir."""
+    prompt_hash = hashlib.sha256(REVIEW_SYSTEM_PROMPT.encode('utf-8')).hexdigest()
+    key = hashlib.sha256(f"{pr['head']['sha']}{MODEL_ID}{prompt_hash}".encode('utf-8')).hexdigest()
+    return f"{REVIEW_CACHE_DIR}/{key}.json"
 
 # ---------- Ana İş Akışı ----------
+def process_pr(pr):
+    """Tek bir PR için inceleme hattını (dosyalar → AI → yorum → Slack) çalıştırır."""
+    try:
+        print(f"📋 PR #{pr['number']} inceleniyor: {pr['title']}")
+        
+        # Bu head commit zaten aynı model ve yönergeyle incelendiyse hiçbir API çağrısı yapma
+        cache_name = review_cache_name(pr)
+        if load_json_cache(cache_name):
+            print(f"ℹ️ PR #{pr['number']} bu commit için zaten incelenmiş, atlanıyor.")
+            return
+        
+        # PR değişikliklerini al
+        changes = get_file_changes(pr)
+        
+        # Değişiklik yoksa atla
+        if not changes:
+            print(f"ℹ️ PR #{pr['number']}'de incelenecek değişiklik bulunmuyor.")
+            return
+        
+        # AI ile kod incelemesi yap
+        review_result = review_code(pr["title"], pr["body"], changes)
+        
+        # İnceleme sonucunu PR'a yorum olarak ekle
+        posted = add_review_comment(pr, review_result)
+        
+        # Yalnızca başarılı ve PR'a yazılmış incelemeler önbelleğe alınır
+        if posted and review_result not in (REVIEW_NO_KEY_TEXT, REVIEW_ERROR_TEXT):
+            save_json_cache(cache_name, {"pr": pr["number"], "head_sha": pr["head"]["sha"],
+                                         "model": MODEL_ID, "review": review_result})
+        
+        # Slack bildirimi gönder
+        notify_slack(f":brain: Chief Architect PR #{pr['number']} incelemesini tamamladı!")
+        
+        print(f"✅ PR #{pr['number']} incelemesi tamamlandı")
+        
+    except Exception as e:
+        print(f"❌ PR #{pr['number']} incelenirken hata oluştu: {str(e)}")
+
 def main():
     """Chief Architect'in ana iş akışı."""
     print("🧠 Chief Architect başlatılıyor...")
@@ -228,31 +315,10 @@ def main():
         
         print(f"🔍 {len(prs_to_review)} adet inceleme bekleyen PR bulundu.")
     
-    for pr in prs_to_review:
-        try:
-            print(f"📋 PR #{pr.number} inceleniyor: {pr.title}")
-            
-            # PR değişikliklerini al
-            changes = get_file_changes(pr)
-            
-            # Değişiklik yoksa atla
-            if not changes:
-                print(f"ℹ️ PR #{pr.number}'de incelenecek değişiklik bulunmuyor.")
-                continue
-            
-            # AI ile kod incelemesi yap
-            review_result = review_code(pr.title, pr.body, changes)
-            
-            # İnceleme sonucunu PR'a yorum olarak ekle
-            add_review_comment(pr, review_result)
-            
-            # Slack bildirimi gönder
-            notify_slack(f":brain: Chief Architect PR #{pr.number} incelemesini tamamladı!")
-            
-            print(f"✅ PR #{pr.number} incelemesi tamamlandı")
-            
-        except Exception as e:
-            print(f"❌ PR #{pr.number} incelenirken hata oluştu: {str(e)}")
+    # PR'lar birbirinden bağımsız; inceleme hatlarını sınırlı sayıda iş parçacığında paralel çalıştır
+    workers = min(MAX_PARALLEL_REVIEWS, len(prs_to_review))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="review") as executor:
+        list(executor.map(process_pr, prs_to_review))
 
 if __name__ == "__main__":
     try:
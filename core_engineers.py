@@ -8,30 +8,67 @@ SimplyECS – Core Engineers AI
 """
 
 import os
+import re
 import sys
 import json
-import yaml
+import textwrap
 import requests
-import time
-from github import Github, GithubException
-import openai
+from crew_common import (GitHubAPIError, commit_files, fetch_pr_files, load_config, gh_get, gh_post,
+                         post_slack, stream_text)
 
 # ---------- Ayarlar ----------
 REPO_FULL = "halitipek/ai-crew-sandbox"
+REPO_PATH = f"/repos/{REPO_FULL}"
 
 # Config'den model bilgilerini oku
-def load_config():
-    try:
-        with open('crew_config.yaml', 'r') as file:
-            config = yaml.safe_load(file)
-            return config.get('crew', {})
-    except Exception as e:
-        print(f"❌ Config dosyası okunamadı: {str(e)}")
-        return {}
-
 CONFIG = load_config()
 CORE_ENG_1_MODEL = CONFIG.get('core_eng_1', {}).get('model', 'gpt-3.5-turbo-0125')
 CORE_ENG_2_MODEL = CONFIG.get('core_eng_2', {}).get('model', 'gpt-3.5-turbo-0125')
+# Config'de 'max_completion_tokens' verilmişse modelin çıktı sınırı yerine o kullanılır
+CORE_ENG_1_MAX_TOKENS = CONFIG.get('core_eng_1', {}).get('max_completion_tokens')
+CORE_ENG_2_MAX_TOKENS = CONFIG.get('core_eng_2', {}).get('max_completion_tokens')
+
+# Tek bir yanıtta üretilebilecek en fazla token (model adı önekine göre, en uzun önek önce);
+# bilinmeyen modeller için en küçük sınır varsayılır
+MODEL_OUTPUT_LIMITS = {
+    "gpt-3.5-turbo": 4096,
+    "gpt-4o-mini": 16384,
+    "gpt-4o": 16384,
+    "gpt-4.1": 32768,
+    "o1": 100000,
+    "o3": 100000,
+    "o4-mini": 100000,
+}
+DEFAULT_OUTPUT_LIMIT = 4096
+# Issue analizi ve dosya başına üretim için ayrılan token bütçeleri
+ANALYSIS_TOKENS = 2000
+FILE_TOKENS = 4000
+
+# GitHub'ın issue kapatma anahtar kelimeleri (örn: "Closes #1", "fixed #12")
+ISSUE_RE = re.compile(r'\b(?:close[sd]?|fix(?:e[sd])?|resolve[sd]?)\s+#(\d+)', re.I)
+
+# Kod üretimi yönergesi; her çağrıda bayt bayt aynı gönderilir ki sağlayıcı
+# tarafındaki prompt önbelleği (ortak önek) devreye girsin
+CODEGEN_SYSTEM_PROMPT = textwrap.dedent("""
+        Sen bir C++ kütüphanesi geliştiren takımın deneyimli bir yazılım mühendisisin. 
+        SimplyECS (Entity Component System) kütüphanesi için kod yazıyorsun.
+        
+        Aşağıdaki kriterlere göre kod yazmalısın:
+        
+        1. Modern C++ (C++17/20) kullan
+        2. Performansı optimize et - ECS sistemleri maksimum verimlilik gerektirir
+        3. Veri odaklı tasarım prensiplerine uy (cache dostu, bellek verimli)
+        4. Okunabilir, bakımı kolay ve iyi dökümante edilmiş kod yaz
+        5. Güvenli bellek yönetimi ve doğru hata kontrolü yap
+        
+        İstenen görev ve detayları dikkatlice oku, belirtilen dosya yollarına uygun şekilde kod üret.
+        
+        Yanıtını yalnızca şu biçimde bir JSON nesnesi olarak ver:
+        {"summary": "<yapılan işlerin özeti>", "files": [{"path": "<dosya yolu>", "content": "<dosyanın tam içeriği>"}]}
+        """).strip()
+
+# C++ kaynak ve başlık dosyası uzantıları
+_CPP_EXT = frozenset({"cpp", "hpp", "h", "cc", "cxx"})
 
 # Ortam değişkenlerini kontrol et
 TOKEN = os.environ.get("GH_PAT")
@@ -53,171 +90,139 @@ if not PR_NUMBER:
     print("❌ Hata: PR_NUMBER ortam değişkeni ayarlanmamış.")
     sys.exit(1)
 
-# API'leri yapılandır
-gh = Github(TOKEN)
-repo = gh.get_repo(REPO_FULL)
-openai.api_key = OPENAI_API_KEY
-
 # ---------- Yardımcı Fonksiyonlar ----------
 def notify_slack(message):
     """Slack'e bildirim gönderir."""
-    try:
-        payload = {"text": message}
-        response = requests.post(SLACK_WEBHOOK, json=payload, timeout=10)
-        response.raise_for_status()
-        return True
-    except requests.exceptions.RequestException as e:
-        print(f"⚠️ Slack bildirimi gönderilemedi: {e}")
-        return False
+    # Bildirim arka planda gönderilir; çıkışta tamamlanması beklenir
+    post_slack(SLACK_WEBHOOK, message)
+    return True
 
 def get_pr(pr_number):
     """PR nesnesini getirir."""
     try:
-        return repo.get_pull(int(pr_number))
-    except GithubException as e:
+        return gh_get(f"{REPO_PATH}/pulls/{int(pr_number)}")
+    except GitHubAPIError as e:
         print(f"❌ PR alınırken hata oluştu: {e.status} - {e.data}")
         return None
+    except requests.exceptions.RequestException as e:
+        print(f"❌ PR alınırken bağlantı hatası: {e}")
+        return None
 
 def get_issue_from_pr(pr):
     """PR'a bağlı issue'yu bulur."""
     try:
         # PR açıklamasından issue referansını bul (örn: "Closes #1")
-        body = pr.body or ""
-        issue_refs = [word for word in body.split() if word.startswith('#')]
+        match = ISSUE_RE.search(pr["body"] or "")
         
-        if not issue_refs:
+        if not match:
             print("⚠️ PR açıklamasında issue referansı bulunamadı.")
             return None
         
         # İlk issue referansını kullan
-        issue_number = int(issue_refs[0].strip('#'))
-        return repo.get_issue(issue_number)
+        issue_number = int(match.group(1))
+        # Issue her inceleme/onay çalıştırmasında yeniden okunur ama nadiren değişir
+        return gh_get(f"{REPO_PATH}/issues/{issue_number}", etag=True)
     except Exception as e:
         print(f"❌ Issue bilgisi alınırken hata oluştu: {str(e)}")
         return None
 
-def get_file_content(pr, file_path):
-    """PR'da belirtilen dosya yolundaki içeriği getirir."""
-    try:
-        content = repo.get_contents(file_path, ref=pr.head.ref)
-        return content.decoded_content.decode('utf-8')
-    except Exception as e:
-        print(f"⚠️ Dosya içeriği alınamadı {file_path}: {e}")
-        return None
-
-def update_file(pr, file_path, content, commit_message):
-    """Belirtilen dosyayı günceller veya oluşturur."""
-    try:
-        # Önce dosyanın mevcut içeriğini ve SHA'sını almaya çalış
-        try:
-            file_content = repo.get_contents(file_path, ref=pr.head.ref)
-            sha = file_content.sha
-            # Dosya var, güncelle
-            repo.update_file(file_path, commit_message, content, sha, branch=pr.head.ref)
-            print(f"✅ Dosya güncellendi: {file_path}")
-        except:
-            # Dosya yok, oluştur
-            repo.create_file(file_path, commit_message, content, branch=pr.head.ref)
-            print(f"✅ Dosya oluşturuldu: {file_path}")
-        
-        return True
-    except Exception as e:
-        print(f"❌ Dosya güncellenirken/oluşturulurken hata: {str(e)}")
-        return False
+def get_file_language(file_path):
+    """Dosya uzantısından dil türünü belirler."""
+    ext = os.path.splitext(file_path)[1].lstrip(".").lower()
+    return "C++" if ext in _CPP_EXT else "Unknown"
 
-def generate_code(prompt, model=CORE_ENG_1_MODEL):
-    """AI modeli kullanarak kod üretir."""
+def generate_code(prompt, model=CORE_ENG_1_MODEL, max_completion_tokens=4000):
+    """AI modeli kullanarak kod üretir ve JSON yanıtı sözlük olarak döndürür."""
     try:
-        system_message = """
-        Sen bir C++ kütüphanesi geliştiren takımın deneyimli bir yazılım mühendisisin. 
-        SimplyECS (Entity Component System) kütüphanesi için kod yazıyorsun.
-        
-        Aşağıdaki kriterlere göre kod yazmalısın:
-        
-        1. Modern C++ (C++17/20) kullan
-        2. Performansı optimize et - ECS sistemleri maksimum verimlilik gerektirir
-        3. Veri odaklı tasarım prensiplerine uy (cache dostu, bellek verimli)
-        4. Okunabilir, bakımı kolay ve iyi dökümante edilmiş kod yaz
-        5. Güvenli bellek yönetimi ve doğru hata kontrolü yap
+        # openai paketi yalnızca kod üretimi gerektiğinde yüklenir
+        import openai
+        openai.api_key = OPENAI_API_KEY
         
-        İstenen görev ve detayları dikkatlice oku, belirtilen dosya yollarına uygun şekilde kod üret.
-        """
-        
-        response = openai.chat.completions.create(
+        stream = openai.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": system_message},
+                {"role": "system", "content": CODEGEN_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
+            response_format={"type": "json_object"},
             temperature=1,
-            max_completion_tokens=4000
+            max_completion_tokens=max_completion_tokens,
+            stream=True
         )
         
-        return response.choices[0].message.content
+        content = stream_text(stream)
+        return json.loads(content)
     
+    except json.JSONDecodeError as e:
+        print(f"❌ AI yanıtı JSON olarak çözümlenemedi: {str(e)}")
+        return None
     except Exception as e:
         print(f"❌ AI kod üretimi sırasında hata oluştu: {str(e)}")
         return None
 
-def analyze_issue(issue_content):
-    """Issue içeriğini analiz ederek görevleri çıkarır."""
-    try:
-        prompt = f"""
-        Aşağıdaki GitHub issue içeriğini analiz et ve yapılması gereken işleri belirle.
-        Görevleri, dosya yollarını ve gerekli kodlama görevlerini liste halinde çıkar.
-        
-        Issue içeriği:
-        {issue_content}
-        
-        Analiz sonucunda şunları belirle:
-        1. Hangi dosyalar oluşturulmalı veya değiştirilmeli?
-        2. Her dosyada ne tür işlevsellik eklenmeli?
-        3. Eklenecek kodun amacı ve teknik detayları neler?
-        """
-        
-        response = openai.chat.completions.create(
-            model=CORE_ENG_1_MODEL,
-            messages=[
-                {"role": "system", "content": "Sen bir görev analizi yapan yazılım mühendisisin."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=1,
-            max_completion_tokens=2000
-        )
-        
-        return response.choices[0].message.content
+def output_token_limit(model, override=None):
+    """Model için tek yanıtta istenebilecek en fazla tokenı döndürür."""
+    if override:
+        return int(override)
+    for prefix in sorted(MODEL_OUTPUT_LIMITS, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_OUTPUT_LIMITS[prefix]
+    return DEFAULT_OUTPUT_LIMIT
+
+def implement_batch(issue_content, file_paths, model, max_tokens):
+    """Issue analizini ve verilen dosyaların kodunu tek bir AI çağrısında üretir."""
+    file_list = "\n".join(f"- {path} ({get_file_language(path)})" for path in file_paths) or "- (boş dosya yok)"
     
-    except Exception as e:
-        print(f"❌ Issue analizi sırasında hata oluştu: {str(e)}")
-        return None
+    prompt = f"""
+    Aşağıdaki GitHub issue içeriğini analiz et ve yapılması gereken işleri belirle.
+    
+    Issue içeriği:
+    {issue_content}
+    
+    Analiz sonucunda şunları belirle ve "summary" alanında özetle:
+    1. Hangi dosyalar oluşturulmalı veya değiştirilmeli?
+    2. Her dosyada ne tür işlevsellik eklenmeli?
+    3. Eklenecek kodun amacı ve teknik detayları neler?
+    
+    Ardından aşağıdaki dosyaların her biri için tam ve eksiksiz kod üret ve "files" alanına ekle.
+    İskelet veya kısmi çözüm değil, tamamen çalışan bir implementasyon bekliyoruz.
+    
+    Dosyalar:
+    {file_list}
+    """
+    
+    # Eski analiz (2000) ve dosya başına üretim (4000) bütçelerinin toplamı, model sınırıyla kırpılır
+    budget = min(max_tokens, ANALYSIS_TOKENS + FILE_TOKENS * len(file_paths))
+    return generate_code(prompt, model, max_completion_tokens=budget)
 
-def implement_task(task_description, file_path):
-    """Belirtilen görevi ve dosya yolunu kullanarak kod üretir."""
-    try:
-        # Dosya uzantısından dil türünü belirle
-        ext = file_path.split('.')[-1].lower()
-        language = "C++" if ext in ["cpp", "hpp", "h", "cc", "cxx"] else "Unknown"
-        
-        prompt = f"""
-        Aşağıdaki görev için {language} kodu yazın:
-        
-        Dosya: {file_path}
-        
-        Görev açıklaması:
-        {task_description}
-        
-        Lütfen dosya için tam ve eksiksiz kod üretin. İskelet veya kısmi çözüm değil,
-        tamamen çalışan bir implementasyon bekliyoruz.
-        """
-        
-        # Farklı model seçimleri arasında denge kuralım
-        model = CORE_ENG_1_MODEL if hash(file_path) % 2 == 0 else CORE_ENG_2_MODEL
-        
-        return generate_code(prompt, model)
+def implement_issue(issue_content, file_paths, model, max_tokens=None):
+    """Issue'yu analiz eder ve boş dosyaların kodunu olabildiğince az AI çağrısında üretir.
+
+    Dosyalar, her çağrının bütçesi modelin çıktı sınırına sığacak şekilde gruplanır;
+    küçük sınırlı modellerde her dosya ayrı bir çağrıda üretilir.
+    `{"summary": str, "files": {yol: içerik}}` döndürür; tüm çağrılar başarısızsa None.
+    """
+    limit = output_token_limit(model, max_tokens)
+    per_call = max(1, (limit - ANALYSIS_TOKENS) // FILE_TOKENS)
+    batches = [file_paths[i:i + per_call] for i in range(0, len(file_paths), per_call)] or [[]]
+    if len(batches) > 1:
+        print(f"ℹ️ {len(file_paths)} dosya {len(batches)} AI çağrısına bölündü (çıktı sınırı: {limit} token).")
     
-    except Exception as e:
-        print(f"❌ Görev implementasyonu sırasında hata oluştu: {str(e)}")
+    summaries, files, succeeded = [], {}, False
+    for batch in batches:
+        result = implement_batch(issue_content, batch, model, limit)
+        if not result:
+            continue
+        succeeded = True
+        if result.get("summary"):
+            summaries.append(result["summary"])
+        for entry in result.get("files") or []:
+            if isinstance(entry, dict) and entry.get("path") and entry.get("content"):
+                files[entry["path"]] = entry["content"]
+    
+    if not succeeded:
         return None
+    return {"summary": "\n\n".join(summaries), "files": files}
 
 def process_pr():
     """PR'ı işler ve gerekli kod değişikliklerini yapar."""
@@ -228,11 +233,11 @@ def process_pr():
             return False
         
         # PR'ın durumunu kontrol et
-        if pr.state != "open":
-            print(f"⚠️ PR #{PR_NUMBER} açık değil, durumu: {pr.state}")
+        if pr["state"] != "open":
+            print(f"⚠️ PR #{PR_NUMBER} açık değil, durumu: {pr['state']}")
             return False
         
-        print(f"ℹ️ PR #{PR_NUMBER} inceleniyor: {pr.title}")
+        print(f"ℹ️ PR #{PR_NUMBER} inceleniyor: {pr['title']}")
         
         # PR'a bağlı issue'yu bul
         issue = get_issue_from_pr(pr)
@@ -240,29 +245,28 @@ def process_pr():
             print("⚠️ PR'a bağlı issue bulunamadı.")
             return False
         
-        print(f"ℹ️ Issue #{issue.number} bulundu: {issue.title}")
+        print(f"ℹ️ Issue #{issue['number']} bulundu: {issue['title']}")
         
-        # Issue içeriğini analiz et ve görevleri belirle
-        issue_analysis = analyze_issue(issue.title + "\n\n" + (issue.body or ""))
-        if not issue_analysis:
-            print("❌ Issue analizi başarısız oldu.")
+        # PR'daki dosyaları ve içeriklerini tek seferde getir; döngüde ağ çağrısı yapılmaz
+        pr_files = fetch_pr_files(REPO_FULL, pr["number"])
+        if pr_files is None:
+            print("❌ PR dosyaları alınamadı.")
             return False
-        
-        print(f"📋 Issue analizi tamamlandı. Görevler belirlendi.")
-        print(issue_analysis)
-        
-        # PR'daki dosyaları incele
-        pr_files = list(pr.get_files())
         tasks = []
         
         for file in pr_files:
-            file_path = file.filename
+            file_path = file["filename"]
+            if file["status"] == "removed":
+                continue
             print(f"ℹ️ Dosya inceleniyor: {file_path}")
             
-            # Dosya içeriği boş mu kontrol et (Orchestrator boş dosya oluşturmuş olabilir)
-            file_content = get_file_content(pr, file_path)
+            # Dosya içeriği boş mu kontrol et (Orchestrator boş dosya oluşturmuş olabilir);
+            # boş dosyalar "" (byteSize 0) gelir, None ise içerik okunamamış demektir
+            file_content = file["content"]
             
-            if not file_content or file_content.strip() == "":
+            if file_content is None:
+                print(f"⚠️ Dosya içeriği okunamadı, atlanıyor: {file_path}")
+            elif file_content.strip() == "":
                 print(f"ℹ️ Dosya boş, doldurulacak: {file_path}")
                 tasks.append({
                     "file_path": file_path,
@@ -271,37 +275,50 @@ def process_pr():
             else:
                 print(f"ℹ️ Dosya zaten içerik içeriyor: {file_path}")
         
-        # Görevleri uygula ve dosyaları güncelle
+        # Issue analizi ve tüm dosyaların kodu tek bir AI çağrısında üretilir;
+        # iki mühendis modeli arasındaki dağılım PR düzeyinde yapılır
+        if pr["number"] % 2 == 0:
+            model, max_tokens = CORE_ENG_1_MODEL, CORE_ENG_1_MAX_TOKENS
+        else:
+            model, max_tokens = CORE_ENG_2_MODEL, CORE_ENG_2_MAX_TOKENS
+        implementation = implement_issue(issue["title"] + "\n\n" + (issue["body"] or ""),
+                                         [task["file_path"] for task in tasks], model, max_tokens)
+        if not implementation:
+            print("❌ Issue analizi ve kod üretimi başarısız oldu.")
+            return False
+        
+        issue_analysis = implementation["summary"]
+        print(f"📋 Issue analizi tamamlandı. Görevler belirlendi.")
+        print(issue_analysis)
+        
+        # Üretilen kodları topla
+        generated = {}
         for task in tasks:
             file_path = task["file_path"]
             
-            # Issue analizini kullanarak dosya için kod üret
-            task_description = f"""
-            Issue analizi:
-            {issue_analysis}
-            
-            Lütfen bu dosyayı implement edin: {file_path}
-            """
-            
-            code = implement_task(task_description, file_path)
+            code = implementation["files"].get(file_path)
             if not code:
                 print(f"❌ Kod üretimi başarısız oldu: {file_path}")
                 continue
-            
-            # Dosyayı güncelle
-            commit_message = f"feat: implement {os.path.basename(file_path)}"
-            update_result = update_file(pr, file_path, code, commit_message)
-            
-            if update_result:
-                print(f"✅ {file_path} başarıyla güncellendi.")
-            else:
-                print(f"❌ {file_path} güncellenirken hata oluştu.")
+            generated[file_path] = code
+        
+        # Tüm dosyaları tek bir commit ile branch'e yaz
+        if generated:
+            commit_message = "feat: implement " + ", ".join(os.path.basename(path) for path in generated)
+            try:
+                commit_sha = commit_files(REPO_FULL, pr["head"]["ref"], generated, commit_message,
+                                          head_sha=pr["head"]["sha"])
+                print(f"✅ {len(generated)} dosya tek commit ile güncellendi: {commit_sha[:7]}")
+            except GitHubAPIError as e:
+                print(f"❌ Dosyalar commit edilirken hata: {e.status} - {e.data}")
+            except requests.exceptions.RequestException as e:
+                print(f"❌ Dosyalar commit edilirken bağlantı hatası: {e}")
         
         # İşlem tamamlandı, PR'a yorum ekle
         comment = f"""
         ## 🛠️ Core Engineers Raporu
         
-        Issue #{issue.number} için kod geliştirildi.
+        Issue #{issue['number']} için kod geliştirildi.
         
         **Güncellenen dosyalar:**
         {chr(10).join(['- ' + task['file_path'] for task in tasks])}
@@ -312,7 +329,7 @@ def process_pr():
         Kodlar hazır, inceleme için QA/Perf ekibine aktarılıyor.
         """
         
-        pr.create_issue_comment(comment)
+        gh_post(f"{REPO_PATH}/issues/{pr['number']}/comments", {"body": comment})
         
         # Slack'e bildirim gönder
         notify_slack(f":gear: Core Engineers, PR #{PR_NUMBER} için kod geliştirmesini tamamladı!")
@@ -0,0 +1,466 @@
+"""
+SimplyECS – AI Crew ortak yardımcıları
+• GitHub REST ve GraphQL çağrıları için paylaşılan HTTP oturumu
+• PR dosyalarını ve içeriklerini toplu olarak getirir
+• Birden çok dosyayı tek commit ile bir branch'e yazar
+• Çalıştırmalar arasında saklanan JSON önbellek dosyaları
+• Slack bildirimlerini arka planda gönderir
+• crew_config.yaml'ı derlenmiş JSON kopyası üzerinden okur
+• Tüm ajanlar tarafından kullanılan hata tipleri
+"""
+
+import os
+import json
+import time
+import atexit
+import random
+import hashlib
+import orjson
+import requests
+from functools import lru_cache
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ---------- Ayarlar ----------
+GH_API_URL = "https://api.github.com"
+GH_GRAPHQL_URL = f"{GH_API_URL}/graphql"
+TOKEN = os.environ.get("GH_PAT")
+# Workflow'lar bu dizini actions/cache ile çalıştırmalar arasında korur
+CACHE_DIR = ".cache"
+CONFIG_PATH = "crew_config.yaml"
+COMPILED_CONFIG_CACHE = "crew_config.json"
+# Koşullu GET istekleri için ETag ve yanıt gövdeleri
+ETAG_CACHE_DIR = "etags"
+# (bağlantı, okuma) zaman aşımları: bağlantı açık tutulduğu için kurulum kısa
+# sürer; yazma işlemleri (mutasyon, commit) GitHub tarafında daha yavaş yanıtlanır.
+GH_TIMEOUT = (3.05, 20)
+GH_WRITE_TIMEOUT = (3.05, 60)
+SLACK_TIMEOUT = (3.05, 5)
+
+# Yetkilendirme başlığı oturuma değil isteğe eklenir; aynı oturum Slack'e de
+# istek gönderebildiği için token'ın GitHub dışına sızmaması gerekir.
+GH_HEADERS = {
+    "Authorization": f"Bearer {TOKEN}",
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+}
+
+# İstek gövdeleri orjson ile bayt olarak kodlanıp data= ile gönderilir; requests'in
+# json= yolu (stdlib json) atlanır
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Tüm GitHub/Slack çağrıları aynı oturumu kullanır; paralel iş parçacıkları havuzda
+# beklemesin diye havuz boyutu işçi sayısından büyük tutulur.
+# Adaptördeki Retry yalnızca GitHub'a bağlanır ve yalnızca geçici 502/503/504
+# yanıtlarını idempotent metotlarda (GET vb.) üstel bekleme ile yeniden dener;
+# POST ile gönderilen mutasyonlar iki kez uygulanmasın. Retry-After başlığı burada
+# dikkate alınmaz (urllib3 süreyi sınırlamaz); hız limitleri (403/429) yalnızca
+# _send içinde, MAX_RATE_LIMIT_WAIT sınırıyla ele alınır.
+_RETRY = Retry(total=5, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+               respect_retry_after_header=False, raise_on_status=False)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+SESSION.mount(GH_API_URL, HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=_RETRY))
+atexit.register(SESSION.close)
+
+# Slack bildirimleri arka planda gönderilir; çıkışta kuyruktaki bildirimler
+# oturum kapanmadan önce tamamlanır (atexit kayıtları ters sırada çalışır)
+_SLACK_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="slack")
+atexit.register(_SLACK_POOL.shutdown, wait=True)
+
+# ---------- Hata Tipleri ----------
+class GitHubAPIError(Exception):
+    """GitHub API'den dönen 4xx/5xx yanıtlarını temsil eder."""
+
+    def __init__(self, status, data):
+        super().__init__(f"{status} - {data}")
+        self.status = status
+        self.data = data
+
+# ---------- Disk Önbelleği ----------
+def load_json_cache(name):
+    """CACHE_DIR altındaki JSON önbellek dosyasını okur; yoksa veya bozuksa None döndürür."""
+    try:
+        with open(os.path.join(CACHE_DIR, name), 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def save_json_cache(name, data):
+    """Veriyi CACHE_DIR altındaki JSON önbellek dosyasına yazar."""
+    path = os.path.join(CACHE_DIR, name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump(data, file)
+    except OSError as e:
+        print(f"⚠️ Önbellek yazılamadı {path}: {e}")
+
+def invalidate_json_cache(name):
+    """JSON önbellek dosyasını siler."""
+    try:
+        os.remove(os.path.join(CACHE_DIR, name))
+    except FileNotFoundError:
+        pass
+
+# ---------- Slack ----------
+def _post_slack(webhook, message):
+    try:
+        response = SESSION.post(webhook, data=orjson.dumps({"text": message}), headers=_JSON_HEADERS,
+                                timeout=SLACK_TIMEOUT)
+        response.raise_for_status()
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ Slack bildirimi gönderilemedi: {e}")
+        return False
+
+def post_slack(webhook, message):
+    """Slack bildirimini arka planda gönderir ve hemen döner; sonucu bir Future'dır."""
+    return _SLACK_POOL.submit(_post_slack, webhook, message)
+
+# ---------- Config ----------
+def load_config():
+    """crew_config.yaml içindeki 'crew' bölümünü döndürür.
+
+    YAML ilk okunuşta JSON olarak önbelleğe yazılır ve sonraki çalıştırmalar
+    YAML içeriğinin özeti değişmediği sürece ayrıştırıcıyı hiç çalıştırmaz.
+    Özet mtime yerine kullanılır; checkout her çalıştırmada mtime'ı yeniler.
+    """
+    try:
+        with open(CONFIG_PATH, 'rb') as file:
+            raw = file.read()
+    except OSError as e:
+        print(f"ℹ️ Config dosyası okunamadı, varsayılan model kullanılacak: {str(e)}")
+        return {}
+
+    digest = hashlib.sha256(raw).hexdigest()
+    compiled = load_json_cache(COMPILED_CONFIG_CACHE)
+    if compiled and compiled.get("sha256") == digest:
+        return compiled.get("crew", {})
+
+    try:
+        # PyYAML yalnızca önbellek geçersizse yüklenir; libyaml varsa C ayrıştırıcısı kullanılır
+        import yaml
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        config = yaml.load(raw, Loader=loader) or {}
+        crew = config.get('crew', {})
+    except Exception as e:
+        print(f"ℹ️ Config dosyası okunamadı, varsayılan model kullanılacak: {str(e)}")
+        return {}
+
+    save_json_cache(COMPILED_CONFIG_CACHE, {"sha256": digest, "crew": crew})
+    return crew
+
+# ---------- OpenAI ----------
+def stream_text(stream):
+    """stream=True ile alınan sohbet yanıtının parçalarını tek metinde birleştirir.
+
+    Üretimler akış olarak istenir: uzun yanıtlarda bağlantı boşta beklemez ve ilk
+    parça üretim başlar başlamaz gelir; bu sırada diğer iş parçacıklarındaki işler sürer.
+    """
+    return "".join(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+
+# ---------- Hız Limitleri ----------
+# Hız limitine takılan bir istek en fazla bu kadar kez, her seferinde en fazla
+# bu kadar saniye beklenerek yeniden gönderilir; sıfırlanması daha uzun sürecekse beklenmez.
+RATE_LIMIT_RETRIES = 2
+MAX_RATE_LIMIT_WAIT = 60
+
+def _rate_limit_wait(resp):
+    """Yanıt bir hız limiti bildiriyorsa beklenecek saniyeyi, aksi halde None döndürür.
+
+    Hız limitlerinin (403 ve 429) ele alındığı tek katman burasıdır; adaptördeki
+    Retry yalnızca 502/503/504'ü, gql() ise POST olan sorgular için yine yalnızca
+    502/503/504'ü yeniden dener. Süre bildirmeyen ya da MAX_RATE_LIMIT_WAIT'ten
+    uzun beklemek gerektiren limitlerde None döner ve istek yeniden gönderilmez.
+    """
+    if resp.status_code not in (403, 429):
+        return None
+    try:
+        if resp.headers.get("Retry-After"):
+            wait = float(resp.headers["Retry-After"])
+        elif resp.headers.get("X-RateLimit-Remaining") == "0" and resp.headers.get("X-RateLimit-Reset"):
+            wait = float(resp.headers["X-RateLimit-Reset"]) - time.time() + 1
+        else:
+            return None
+    except ValueError:
+        return None
+    return max(wait, 0) if wait <= MAX_RATE_LIMIT_WAIT else None
+
+def _send(method, url, **kwargs):
+    """İsteği gönderir; hız limitinde Retry-After / X-RateLimit-Reset kadar bekleyip
+    en fazla RATE_LIMIT_RETRIES kez yeniden dener."""
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        resp = SESSION.request(method, url, **kwargs)
+        wait = _rate_limit_wait(resp)
+        if wait is None or attempt == RATE_LIMIT_RETRIES:
+            return resp
+        print(f"⚠️ GitHub hız limiti, {wait:.0f} sn beklenip yeniden denenecek: {url}")
+        time.sleep(wait)
+
+# ---------- GitHub REST Yardımcıları ----------
+def gh_request(method, path, **kwargs):
+    """GitHub REST API'ye istek gönderir, hata durumunda GitHubAPIError fırlatır."""
+    url = path if path.startswith("https://") else f"{GH_API_URL}{path}"
+    headers = {**GH_HEADERS, **kwargs.pop("headers", {})}
+    kwargs.setdefault("timeout", GH_TIMEOUT if method == "GET" else GH_WRITE_TIMEOUT)
+
+    resp = _send(method, url, headers=headers, **kwargs)
+    if resp.status_code >= 400:
+        try:
+            data = resp.json()
+        except ValueError:
+            data = resp.text[:200]
+        raise GitHubAPIError(resp.status_code, data)
+    return resp
+
+def gh_get(path, etag=False, **params):
+    """GET isteği gönderir ve JSON yanıtı döndürür.
+
+    `etag=True` yalnızca çalıştırmalar arasında tekrar tekrar okunan ve nadiren
+    değişen uçlar için verilir: yanıtın ETag'i gövdesiyle birlikte önbelleğe yazılır
+    ve sonraki çağrılarda If-None-Match olarak gönderilir; 304 yanıtları hız
+    limitinden düşmez ve gövde önbellekten döner. Tek seferlik ya da değişmez
+    (ör. git/commits/{sha}) okumalar önbelleği büyütmesin diye varsayılan kapalıdır.
+    """
+    if not etag:
+        return orjson.loads(gh_request("GET", path, params=params or None).content)
+
+    key = hashlib.sha256(f"{path}?{sorted(params.items())}".encode('utf-8')).hexdigest()
+    cache_name = f"{ETAG_CACHE_DIR}/{key}.json"
+    cached = load_json_cache(cache_name)
+    # Eksik alanlı ya da bozuk bir kayıt önbellekte yokmuş gibi ele alınır
+    if not isinstance(cached, dict) or not cached.get("etag") or "body" not in cached:
+        cached = None
+    headers = {"If-None-Match": cached["etag"]} if cached else {}
+
+    resp = gh_request("GET", path, params=params or None, headers=headers)
+    if resp.status_code == 304 and cached:
+        return cached["body"]
+    data = orjson.loads(resp.content)
+    if resp.headers.get("ETag"):
+        save_json_cache(cache_name, {"etag": resp.headers["ETag"], "body": data})
+    return data
+
+def gh_post(path, payload):
+    """POST isteği gönderir ve JSON yanıtı döndürür."""
+    return orjson.loads(gh_request("POST", path, data=orjson.dumps(payload), headers=_JSON_HEADERS).content)
+
+def gh_patch(path, payload):
+    """PATCH isteği gönderir ve JSON yanıtı döndürür."""
+    return orjson.loads(gh_request("PATCH", path, data=orjson.dumps(payload), headers=_JSON_HEADERS).content)
+
+def gh_paginate(path, **params):
+    """Sayfalı bir liste uç noktasının tüm öğelerini Link başlığını izleyerek toplar."""
+    params.setdefault("per_page", 100)
+    resp = gh_request("GET", path, params=params)
+    items = orjson.loads(resp.content)
+    while "next" in resp.links:
+        resp = gh_request("GET", resp.links["next"]["url"])
+        items.extend(orjson.loads(resp.content))
+    return items
+
+# ---------- GraphQL yardımcı fonksiyon ----------
+# GraphQL istekleri POST olduğu için adaptör 502/503/504'ü yeniden denemez.
+# Salt okunur sorgular için bu durumlar burada, jitter'lı üstel bekleme ile
+# tekrarlanır; mutasyonlar iki kez uygulanabileceği için tekrarlanmaz.
+GQL_GATEWAY_RETRIES = 3
+_GATEWAY_STATUSES = frozenset((502, 503, 504))
+
+@lru_cache(maxsize=64)
+def _query_prefix(query):
+    """Sorgunun JSON gövdesindeki sabit kısmını bir kez kodlar."""
+    return b'{"query":' + orjson.dumps(query) + b',"variables":'
+
+def gql(query: str, variables: dict | None = None):
+    """GraphQL sorgusu gönderir ve yanıtı JSON olarak döndürür veya hata durumunda None."""
+    try:
+        # Sorgu metni her çağrıda yeniden kodlanmaz; yalnızca değişkenler eklenir
+        body = _query_prefix(query) + orjson.dumps(variables or {}) + b'}'
+        headers = {**GH_HEADERS, **_JSON_HEADERS}
+        is_mutation = query.lstrip().startswith("mutation")
+        retries = 0 if is_mutation else GQL_GATEWAY_RETRIES
+        timeout = GH_WRITE_TIMEOUT if is_mutation else GH_TIMEOUT
+        for attempt in range(retries + 1):
+            resp = _send("POST", GH_GRAPHQL_URL, headers=headers, data=body, timeout=timeout)
+            if resp.status_code not in _GATEWAY_STATUSES or attempt == retries:
+                break
+            wait = 0.5 * 2 ** attempt * (0.5 + random.random())
+            print(f"⚠️ GraphQL {resp.status_code} yanıtı, {wait:.1f} sn sonra yeniden denenecek")
+            time.sleep(wait)
+            # Yeniden deneme bağlantısı yanıttan sonra kapatılır; sorunlu uca bağlı bir
+            # bağlantı havuza geri dönüp sonraki çağrılarda kullanılmaz
+            headers["Connection"] = "close"
+        resp.raise_for_status()
+        json_resp = orjson.loads(resp.content)
+        if "errors" in json_resp:
+            print(f"❌ GraphQL Query Error: {json.dumps(json_resp['errors'], indent=2)}")
+            return None
+        if "data" not in json_resp or not json_resp["data"]:
+             # Sorgu başarılı olsa bile veri yoksa veya null ise None döndür
+             return None
+        return json_resp
+    except requests.exceptions.Timeout:
+        print("❌ HTTP Request Error: Timeout")
+        return None
+    except requests.exceptions.RequestException as e:
+        print(f"❌ HTTP Request Error: {e}")
+        return None
+    except json.JSONDecodeError as e:
+        print(f"❌ JSON Decode Error: {e} - Response text starts with: {resp.text[:200]}")
+        return None
+
+def dig(data, *path, default=None):
+    """İç içe GraphQL yanıtında verilen yolu izler; eksik veya null bir adımda `default` döndürür."""
+    for key in path:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
+        if data is None:
+            return default
+    return data
+
+def compact_gql(document):
+    """GraphQL dokümanındaki girinti ve satır sonlarını tek boşluğa indirir."""
+    return " ".join(document.split())
+
+# ---------- PR dosyaları ----------
+# GraphQL changeType değerlerinin REST API'deki "status" karşılıkları
+_CHANGE_TYPE_STATUS = {
+    "ADDED": "added",
+    "DELETED": "removed",
+    "MODIFIED": "modified",
+    "RENAMED": "renamed",
+    "COPIED": "copied",
+    "CHANGED": "changed",
+}
+
+_Q_PR_FILES = """
+query($o:String!,$n:String!,$number:Int!,$cursor:String){
+  repository(owner:$o,name:$n){
+    pullRequest(number:$number){
+      headRefOid
+      files(first:100, after:$cursor){
+        nodes{ path additions deletions changeType }
+        pageInfo{ endCursor hasNextPage }
+      }
+    }
+  }
+}"""
+
+def fetch_blobs(repo_full, ref, paths):
+    """Verilen yolların içeriklerini tek bir takma adlı GraphQL sorgusuyla getirir.
+
+    `{yol: içerik}` döndürür; içeriği okunamayan (ikili, bulunamayan veya REST
+    yedeği başarısız olan) yollar sözlükte yer almaz. Sorgunun kendisi başarısız
+    olursa None döner; çağıran bunu "tüm dosyalar boş" olarak yorumlamamalıdır.
+    """
+    owner, name = repo_full.split("/")
+    params = ", ".join(f"$e{i}:String!" for i in range(len(paths)))
+    fields = "\n".join(
+        f"f{i}: object(expression:$e{i}){{ ... on Blob {{ text byteSize isTruncated isBinary }} }}"
+        for i in range(len(paths))
+    )
+    query = f"query($o:String!,$n:String!,{params}){{ repository(owner:$o,name:$n){{ {fields} }} }}"
+    variables = {"o": owner, "n": name}
+    variables.update({f"e{i}": f"{ref}:{path}" for i, path in enumerate(paths)})
+
+    resp = gql(query, variables)
+    objects = dig(resp, "data", "repository")
+    if objects is None:
+        return None
+
+    contents = {}
+    for i, path in enumerate(paths):
+        blob = objects.get(f"f{i}")
+        if not blob or blob.get("isBinary"):
+            continue
+        if blob.get("byteSize") == 0:
+            contents[path] = ""
+            continue
+        if blob.get("isTruncated"):
+            # GraphQL büyük dosyaların metnini kırpar; bu dosyalar için REST'e düş
+            try:
+                contents[path] = gh_request("GET", f"/repos/{repo_full}/contents/{quote(path)}",
+                                            params={"ref": ref},
+                                            headers={"Accept": "application/vnd.github.raw"}).text
+            except (GitHubAPIError, requests.exceptions.RequestException) as e:
+                print(f"⚠️ Dosya içeriği alınamadı {path}: {e}")
+            continue
+        contents[path] = blob.get("text")
+    return contents
+
+def list_pr_files(repo_full, number):
+    """PR'daki dosya düğümlerini sayfa başına 100 dosyayla GraphQL üzerinden listeler.
+
+    `(head_oid, düğümler)` döndürür; içerik getirilmez. Hata durumunda None döner.
+    """
+    owner, name = repo_full.split("/")
+    nodes, cursor, head_oid = [], None, None
+    while True:
+        resp = gql(_Q_PR_FILES, {"o": owner, "n": name, "number": int(number), "cursor": cursor})
+        if not resp:
+            return None
+        pull = resp["data"]["repository"]["pullRequest"]
+        head_oid = pull["headRefOid"]
+        nodes.extend(pull["files"]["nodes"])
+        page = pull["files"]["pageInfo"]
+        if not page["hasNextPage"]:
+            break
+        cursor = page["endCursor"]
+    return head_oid, nodes
+
+def fetch_pr_files(repo_full, number):
+    """PR'daki dosyaları ve head commit'teki içeriklerini iki GraphQL çağrısında getirir.
+
+    Dönen liste REST `pulls/{n}/files` alan adlarını kullanır; silinmiş, ikili
+    veya içeriği okunamayan dosyaların `content` değeri None, boş dosyalarınki
+    "" olur. Liste veya içerik sorgusu başarısız olursa None döner.
+    """
+    listing = list_pr_files(repo_full, number)
+    if listing is None:
+        return None
+    head_oid, nodes = listing
+
+    live_paths = [n["path"] for n in nodes if n["changeType"] != "DELETED"]
+    contents = fetch_blobs(repo_full, head_oid, live_paths) if live_paths else {}
+    if contents is None:
+        return None
+
+    return [{
+        "filename": n["path"],
+        "status": _CHANGE_TYPE_STATUS.get(n["changeType"], n["changeType"].lower()),
+        "additions": n["additions"],
+        "deletions": n["deletions"],
+        "content": contents.get(n["path"]),
+    } for n in nodes]
+
+# ---------- Git Data API ----------
+def commit_files(repo_full, branch, files, message, head_sha=None):
+    """Dosyaları (`{yol: içerik}`) branch'e tek bir commit olarak yazar ve commit SHA'sını döndürür.
+
+    Dosya içerikleri ağaç girdilerine gömülür; blob'ları ayrıca oluşturmaya ve
+    mevcut dosyaların SHA'larını sorgulamaya gerek kalmaz. Çağıran branch'in
+    head SHA'sını zaten biliyorsa `head_sha` ile verilir ve ref sorgusu atlanır;
+    branch bu arada ilerlemişse ref güncellemesi fast-forward olmadığı için
+    reddedilir. Hata durumunda GitHubAPIError fırlatır.
+    """
+    repo_path = f"/repos/{repo_full}"
+    if not head_sha:
+        head_sha = gh_get(f"{repo_path}/git/ref/heads/{branch}")["object"]["sha"]
+    base_tree = gh_get(f"{repo_path}/git/commits/{head_sha}")["tree"]["sha"]
+
+    tree = gh_post(f"{repo_path}/git/trees", {
+        "base_tree": base_tree,
+        "tree": [{"path": path, "mode": "100644", "type": "blob", "content": content}
+                 for path, content in files.items()],
+    })
+    commit = gh_post(f"{repo_path}/git/commits", {
+        "message": message,
+        "tree": tree["sha"],
+        "parents": [head_sha],
+    })
+    gh_patch(f"{repo_path}/git/refs/heads/{branch}", {"sha": commit["sha"]})
+    return commit["sha"]
@@ -6,14 +6,28 @@ SimplyECS – AI Orchestrator bootstrap
 •  Slack ping gönderir
 """
 
-import os, requests, textwrap, json
-from github import Github, GithubException
+import os, time, requests, json, orjson
+from concurrent.futures import ThreadPoolExecutor
+from crew_common import SESSION, SLACK_TIMEOUT, gql, compact_gql, dig, load_json_cache, save_json_cache, invalidate_json_cache
 
 # ---------- Ayarlar ----------
 REPO_FULL    = "halitipek/ai-crew-sandbox"
+_OWNER, _NAME = REPO_FULL.split("/", 1)
 ISSUE_NUMBER = 1
 BRANCH       = "feature/mvp1_world_skeleton"
 SLACK_TEXT   = ":rocket: PR *#{pr}* opened for MVP‑1 → {url}"
+PROJECT_TITLE = "SimplyECS"
+IDS_CACHE    = "project_ids.json"
+# Önbellek kaydının biçimi değiştiğinde artırılır; eski kayıtlar yeniden sorgulanır
+IDS_CACHE_VERSION = 1
+# Proje kimlikleri en fazla bu kadar saniye önbellekten kullanılır (varsayılan 24 saat)
+IDS_TTL      = int(os.environ.get("ORCHESTRATOR_IDS_TTL", 24 * 60 * 60))
+# ORCHESTRATOR_REFRESH_IDS=1 önbelleği yok sayıp kimlikleri yeniden sorgular
+REFRESH_IDS  = os.environ.get("ORCHESTRATOR_REFRESH_IDS") == "1"
+# ORCH_DEBUG=1 kimlik ve seçenek ayrıntılarını yazdırır
+DEBUG        = os.environ.get("ORCH_DEBUG") == "1"
+# Birbirinden bağımsız GitHub çağrıları için; ikincil hız limitlerine takılmamak için küçük tutulur
+MAX_WORKERS  = 4
 
 TOKEN   = os.environ.get("GH_PAT")
 SLACK   = os.environ.get("SLACK_WEBHOOK")
@@ -25,88 +39,131 @@ if not SLACK:
     print("❌ Hata: SLACK_WEBHOOK ortam değişkeni ayarlanmamış.")
     exit(1)
 
-GH_API  = "https://api.github.com/graphql"
-HEADERS = {"Authorization": f"Bearer {TOKEN}"} # X-Github-Next-Global-ID başlığı kaldırıldı
+# ---------- GraphQL dokümanları ----------
+# Tüm sorgular içe aktarmada bir kez oluşturulur ve boşlukları atılarak
+# sıkıştırılır; her çağrıda yalnızca değişkenler değişir.
+FILES_TO_ADD = ("src/ecs/World.hpp", "src/ecs/World.cpp")
 
-gh   = Github(TOKEN)
-repo = gh.get_repo(REPO_FULL)
+# Proje listesi, her projenin Status alanı ve issue'nun proje kartları aynı yanıtta gelir;
+# projeler sunucu tarafında başlığa göre süzülür
+_Q_PROJECT_IDS = compact_gql("""
+query ProjectIds($o:String!,$n:String!,$issue:Int!,$project:String!){
+  viewer { projectsV2(first:5, query:$project){nodes{id title ...StatusField}} }
+  repository(owner:$o,name:$n){
+    projectsV2(first:5, query:$project){nodes{id title ...StatusField}}
+    issue(number:$issue){
+      id
+      projectItems(first:10){ nodes{ id project{ id } } }
+    }
+  }
+}
+fragment StatusField on ProjectV2 {
+  field(name:"Status"){
+    ... on ProjectV2SingleSelectField {
+      id
+      options {
+        id
+        name
+      }
+    }
+  }
+}""")
 
-# ---------- GraphQL yardımcı fonksiyon ----------
-def gql(query: str, variables: dict | None = None):
-    """GraphQL sorgusu gönderir ve yanıtı JSON olarak döndürür veya hata durumunda None."""
-    try:
-        resp = requests.post(GH_API, headers=HEADERS,
-                             json={"query": query, "variables": variables or {}},
-                             timeout=30)
-        resp.raise_for_status()
-        json_resp = resp.json()
-        if "errors" in json_resp:
-            print(f"❌ GraphQL Query Error: {json.dumps(json_resp['errors'], indent=2)}")
-            return None
-        if "data" not in json_resp or not json_resp["data"]:
-             # Sorgu başarılı olsa bile veri yoksa veya null ise None döndür
-             # print(f"ℹ️ GraphQL query successful but returned no data or null data: {json_resp}")
-             return None
-        return json_resp
-    except requests.exceptions.Timeout:
-        print("❌ HTTP Request Error: Timeout")
-        return None
-    except requests.exceptions.RequestException as e:
-        print(f"❌ HTTP Request Error: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON Decode Error: {e} - Response text starts with: {resp.text[:200]}")
-        return None
+_M_ADD_ITEM = compact_gql("""
+mutation AddProjectItem($project:ID!, $content:ID!) {
+  addProjectV2ItemById(input: {
+    projectId: $project,
+    contentId: $content
+  }) {
+    item {
+      id
+    }
+  }
+}""")
+
+_M_UPDATE_ITEM = compact_gql("""
+mutation MoveProjectItem($project:ID!, $item:ID!, $field:ID!, $value:String!) {
+  updateProjectV2ItemFieldValue(input: {
+    projectId: $project,
+    itemId: $item,
+    fieldId: $field,
+    value: {
+      singleSelectOptionId: $value
+    }
+  }) {
+    projectV2Item {
+      id
+    }
+  }
+}""")
+
+# Depo ID'si, branch head'leri, açık PR ve FILES_TO_ADD dosyalarının varlığı
+_Q_BRANCH_STATE = compact_gql("""
+query BranchState($o:String!,$n:String!,$branch:String!,$qualified:String!,""" +
+    ",".join(f"$e{i}:String!" for i in range(len(FILES_TO_ADD))) + """){
+  repository(owner:$o,name:$n){
+    id
+    main: ref(qualifiedName:"refs/heads/main"){ target{ oid } }
+    branch: ref(qualifiedName:$qualified){ target{ oid } }
+    pullRequests(headRefName:$branch, baseRefName:"main", states:OPEN, first:1){ nodes{ number url } }
+    """ + " ".join(f"f{i}: object(expression:$e{i}){{ id }}" for i in range(len(FILES_TO_ADD))) + """
+  }
+}""")
+
+_M_CREATE_REF = compact_gql("""
+mutation CreateBranch($repo:ID!, $name:String!, $oid:GitObjectID!) {
+  createRef(input:{repositoryId:$repo, name:$name, oid:$oid}) {
+    ref { target { oid } }
+  }
+}""")
+
+_M_CREATE_COMMIT = compact_gql("""
+mutation AddFiles($input:CreateCommitOnBranchInput!) {
+  createCommitOnBranch(input:$input) { commit { oid } }
+}""")
+
+_M_CREATE_PR = compact_gql("""
+mutation OpenPullRequest($repo:ID!, $head:String!, $title:String!, $body:String!) {
+  createPullRequest(input:{repositoryId:$repo, baseRefName:"main", headRefName:$head,
+                           title:$title, body:$body}) {
+    pullRequest { number url }
+  }
+}""")
+
+_M_ADD_COMMENT = compact_gql("""
+mutation CommentOnIssue($subject:ID!, $body:String!) {
+  addComment(input:{subjectId:$subject, body:$body}) { commentEdge { node { id } } }
+}""")
 
 # ---------- Proje ve alan kimliklerini al ----------
-def fetch_project_and_status_info():
-    """Proje ID'sini, Status alanını ve 'Dev' seçeneğini alır."""
-    owner, name = REPO_FULL.split("/")
-
-    # 1) Proje ID'si
-    q_proj = """
-    query($o:String!,$n:String!){
-      viewer { projectsV2(first:20){nodes{id title}} }
-      repository(owner:$o,name:$n){
-        projectsV2(first:20){nodes{id title}}
-      }
-    }"""
-    proj_resp = gql(q_proj, {"o": owner, "n": name})
+def fetch_project_and_status_info(issue_number):
+    """Proje, Status alanı, 'Dev' seçeneği ve issue kimliklerini tek GraphQL sorgusunda alır.
+
+    Issue zaten projedeyse kartın ProjectV2Item ID'si de döner; aksi halde
+    `project_item_id` None olur.
+    """
+    proj_resp = gql(_Q_PROJECT_IDS, {"o": _OWNER, "n": _NAME, "issue": issue_number, "project": PROJECT_TITLE})
     if not proj_resp: raise ValueError("Proje ID'si sorgusu başarısız.")
     data = proj_resp["data"]
-    viewer_nodes = data.get("viewer", {}).get("projectsV2", {}).get("nodes", []) or []
-    repo_nodes = data.get("repository", {}).get("projectsV2", {}).get("nodes", []) or []
+    viewer_nodes = dig(data, "viewer", "projectsV2", "nodes", default=[])
+    repo_nodes = dig(data, "repository", "projectsV2", "nodes", default=[])
     nodes = viewer_nodes + repo_nodes
     if not nodes: raise ValueError(f"'{REPO_FULL}' için hiç GitHub Projesi bulunamadı.")
-    proj = next((n for n in nodes if n and "SimplyECS" in n.get("title", "")), None)
-    if not proj: raise ValueError("'SimplyECS' içeren bir proje bulunamadı.")
+    proj = next((n for n in nodes if n and PROJECT_TITLE in n.get("title", "")), None)
+    if not proj: raise ValueError(f"'{PROJECT_TITLE}' içeren bir proje bulunamadı.")
     project_id = proj["id"]
     print("🔍  Using project:", proj["title"])
 
-    # 2) Status Alanı ve Seçenekleri Tek Sorguda Al
-    q_field_options = """
-    query($p:ID!){
-      node(id:$p){
-        ... on ProjectV2 {
-          field(name:"Status"){
-            ... on ProjectV2SingleSelectField {
-              id
-              name
-              options {
-                id
-                name
-              }
-            }
-          }
-        }
-      }
-    }"""
-    
-    field_resp = gql(q_field_options, {"p": project_id})
-    if not field_resp: raise ValueError("Status alanı sorgusu başarısız.")
-    
+    issue_id = dig(data, "repository", "issue", "id")
+    if not issue_id: raise ValueError(f"Issue #{issue_number} için ID bulunamadı.")
+    items = dig(data, "repository", "issue", "projectItems", "nodes", default=[])
+    project_item_id = next((item["id"] for item in items
+                            if dig(item, "project", "id") == project_id), None)
+    if DEBUG:
+        print(f"DEBUG: Issue #{issue_number} ID: {issue_id}, ProjectV2Item ID: {project_item_id}")
+
     try:
-        field_data = field_resp.get("data", {}).get("node", {}).get("field", {})
+        field_data = proj.get("field") or {}
         if not field_data: 
             raise ValueError("Status alanı bulunamadı.")
         
@@ -128,126 +185,77 @@ def fetch_project_and_status_info():
         if not dev_option_id:
             raise ValueError("'Dev' seçeneğinin ID'si bulunamadı.")
         
-        print(f"DEBUG: Status field options: {json.dumps(options, indent=2)}")
-        print(f"DEBUG: Using Status Field ID: {status_field_id}")
-        print(f"DEBUG: Using Dev option ID: {dev_option_id}")
-        
-        return project_id, status_field_id, dev_option_id
+        if DEBUG:
+            print(f"DEBUG: Status field options: {json.dumps(options, indent=2)}")
+            print(f"DEBUG: Using Status Field ID: {status_field_id}")
+            print(f"DEBUG: Using Dev option ID: {dev_option_id}")
         
     except Exception as e:
         raise ValueError(f"Status alanı bilgileri alınırken hata: {str(e)}")
 
-# ---------- Issue'yu Proje Kartına Dönüştür ve Taşı ----------
-def move_issue_card_to_dev(issue_number, project_id, status_field_id, dev_option_id):
-    """Issue'yu projeye ekler ve Dev statüsüne taşır."""
-    
-    # 1. Adım: Issue'nun içerik ID'sini al (GitHub node ID)
-    issue_query = """
-    query($owner:String!, $repo:String!, $issue:Int!) {
-      repository(owner:$owner, name:$repo) {
-        issue(number:$issue) {
-          id
-        }
-      }
+    return {
+        "project_id": project_id,
+        "status_field_id": status_field_id,
+        "dev_option_id": dev_option_id,
+        "issue_id": issue_id,
+        "project_item_id": project_item_id,
     }
+
+def get_project_ids(issue_number, refresh=REFRESH_IDS):
+    """Proje, Status alanı, 'Dev' seçeneği ve issue kimliklerini önbellekten veya GraphQL'den alır.
+
+    `(ids, önbellekten_mi)` döndürür. Önbellek dosyası depo adına göre anahtarlanır;
+    IDS_TTL saniyeden eski, farklı biçim sürümüyle veya başka bir issue için yazılmış
+    kayıtlar yeniden sorgulanır.
     """
-    
-    owner, repo_name = REPO_FULL.split("/")
-    issue_resp = gql(issue_query, {"owner": owner, "repo": repo_name, "issue": issue_number})
-    
-    if not issue_resp:
-        print(f"❌ Issue #{issue_number} için ID alınamadı.")
-        return False
+    cached = None if refresh else (load_json_cache(IDS_CACHE) or {}).get(REPO_FULL)
+    if (cached
+            and all(cached.get(key) for key in ("project_id", "status_field_id", "dev_option_id", "issue_id"))
+            and cached.get("v") == IDS_CACHE_VERSION
+            and cached.get("issue_number") == issue_number
+            and time.time() - cached.get("fetched_at", 0) < IDS_TTL):
+        print("ℹ️ Proje kimlikleri önbellekten okundu.")
+        return cached, True
+
+    ids = fetch_project_and_status_info(issue_number)
+    ids.update(v=IDS_CACHE_VERSION, issue_number=issue_number, fetched_at=time.time())
+    save_project_ids(ids)
+    return ids, False
+
+def save_project_ids(ids):
+    """Kimlikleri depo adı altında önbelleğe yazar."""
+    save_json_cache(IDS_CACHE, {REPO_FULL: ids})
+
+# ---------- Issue'yu Proje Kartına Dönüştür ve Taşı ----------
+def move_issue_card_to_dev(issue_number, ids):
+    """Issue'yu projeye ekler (kartı yoksa) ve Dev statüsüne taşır."""
     
     try:
-        issue_id = issue_resp.get("data", {}).get("repository", {}).get("issue", {}).get("id")
-        if not issue_id:
-            print(f"❌ Issue #{issue_number} için ID bulunamadı.")
-            return False
-            
-        print(f"DEBUG: Issue #{issue_number} ID: {issue_id}")
-        
-        # 2. Adım: Issue'yu projeye ekle (zaten ekliyse sorun değil)
-        add_issue_mutation = """
-        mutation($project:ID!, $content:ID!) {
-          addProjectV2ItemById(input: {
-            projectId: $project,
-            contentId: $content
-          }) {
-            item {
-              id
-            }
-          }
-        }
-        """
-        
-        add_resp = gql(add_issue_mutation, {"project": project_id, "content": issue_id})
-        
-        # Item ID'yi al
-        project_item_id = None
-        if add_resp and add_resp.get("data", {}).get("addProjectV2ItemById", {}).get("item", {}).get("id"):
-            project_item_id = add_resp["data"]["addProjectV2ItemById"]["item"]["id"]
-            print(f"DEBUG: Issue added to project, got ProjectV2Item ID: {project_item_id}")
-        else:
-            # Issue zaten projede olabilir, o zaman direkt sorguyla ID'yi alalım
-            find_item_query = """
-            query($project:ID!, $issue:ID!) {
-              node(id: $project) {
-                ... on ProjectV2 {
-                  items(first: 100) {
-                    nodes {
-                      id
-                      content {
-                        ... on Issue {
-                          id
-                        }
-                      }
-                    }
-                  }
-                }
-              }
-            }
-            """
-            
-            find_resp = gql(find_item_query, {"project": project_id, "issue": issue_id})
-            if find_resp:
-                items = find_resp.get("data", {}).get("node", {}).get("items", {}).get("nodes", [])
-                for item in items:
-                    if item.get("content", {}).get("id") == issue_id:
-                        project_item_id = item.get("id")
-                        print(f"DEBUG: Found existing ProjectV2Item ID: {project_item_id}")
-                        break
+        # 1. Adım: Kart önceden bulunamadıysa issue'yu projeye ekle; mutasyon
+        # issue zaten projedeyse mevcut kartı döndürür
+        project_item_id = ids.get("project_item_id")
+        if not project_item_id:
+            add_resp = gql(_M_ADD_ITEM, {"project": ids["project_id"], "content": ids["issue_id"]})
+            project_item_id = dig(add_resp, "data", "addProjectV2ItemById", "item", "id")
+            if project_item_id:
+                if DEBUG:
+                    print(f"DEBUG: Issue added to project, got ProjectV2Item ID: {project_item_id}")
+                # Sonraki çalıştırmalar ekleme mutasyonunu atlasın
+                save_project_ids({**ids, "project_item_id": project_item_id})
             
         if not project_item_id:
             print("❌ Issue'nun ProjectV2Item ID'si alınamadı.")
             return False
             
-        # 3. Adım: Kartı Dev statüsüne taşı
-        update_mutation = """
-        mutation($project:ID!, $item:ID!, $field:ID!, $value:String!) {
-          updateProjectV2ItemFieldValue(input: {
-            projectId: $project,
-            itemId: $item,
-            fieldId: $field,
-            value: {
-              singleSelectOptionId: $value
-            }
-          }) {
-            projectV2Item {
-              id
-            }
-          }
-        }
-        """
-        
-        update_resp = gql(update_mutation, {
-            "project": project_id,
+        # 2. Adım: Kartı Dev statüsüne taşı
+        update_resp = gql(_M_UPDATE_ITEM, {
+            "project": ids["project_id"],
             "item": project_item_id,
-            "field": status_field_id,
-            "value": dev_option_id
+            "field": ids["status_field_id"],
+            "value": ids["dev_option_id"]
         })
         
-        if update_resp and update_resp.get("data", {}).get("updateProjectV2ItemFieldValue"):
+        if dig(update_resp, "data", "updateProjectV2ItemFieldValue"):
             print(f"✅ Issue #{issue_number} kartı başarıyla 'Dev' durumuna taşındı!")
             return True
         else:
@@ -258,13 +266,115 @@ def move_issue_card_to_dev(issue_number, project_id, status_field_id, dev_option
         print(f"❌ Kart işlemi sırasında hata: {str(e)}")
         return False
 
+# ---------- Branch, dosya ve PR işlemleri (GraphQL) ----------
+def fetch_branch_state():
+    """Depo ID'si, main ve feature branch head'leri, açık PR ve dosya varlığını tek sorguda alır."""
+    variables = {"o": _OWNER, "n": _NAME, "branch": BRANCH, "qualified": f"refs/heads/{BRANCH}"}
+    variables.update({f"e{i}": f"{BRANCH}:{path}" for i, path in enumerate(FILES_TO_ADD)})
+    resp = gql(_Q_BRANCH_STATE, variables)
+    if not resp:
+        return None
+    repo_data = resp["data"]["repository"]
+    return {
+        "repo_id": repo_data["id"],
+        "main_oid": dig(repo_data, "main", "target", "oid"),
+        "branch_oid": dig(repo_data, "branch", "target", "oid"),
+        "pr": next(iter(repo_data["pullRequests"]["nodes"]), None),
+        "missing_files": [path for i, path in enumerate(FILES_TO_ADD) if not repo_data.get(f"f{i}")],
+    }
+
+def create_branch(repo_id, oid):
+    """BRANCH'i verilen commit'ten oluşturur ve head OID'sini döndürür."""
+    resp = gql(_M_CREATE_REF, {"repo": repo_id, "name": f"refs/heads/{BRANCH}", "oid": oid})
+    if not resp:
+        return None
+    return resp["data"]["createRef"]["ref"]["target"]["oid"]
+
+def add_empty_files(paths, head_oid):
+    """Boş dosyaları branch'e tek bir commit olarak ekler ve commit OID'sini döndürür."""
+    resp = gql(_M_CREATE_COMMIT, {"input": {
+        "branch": {"repositoryNameWithOwner": REPO_FULL, "branchName": BRANCH},
+        "message": {"headline": "feat: add empty " + ", ".join(os.path.basename(p) for p in paths)},
+        # Boş içerik base64 olarak da boş dizedir
+        "fileChanges": {"additions": [{"path": path, "contents": ""} for path in paths]},
+        "expectedHeadOid": head_oid,
+    }})
+    if not resp:
+        return None
+    return resp["data"]["createCommitOnBranch"]["commit"]["oid"]
+
+def create_pull_request(repo_id):
+    """BRANCH'ten main'e PR açar ve `{number, url}` döndürür."""
+    resp = gql(_M_CREATE_PR, {
+        "repo": repo_id,
+        "head": BRANCH,
+        "title": "feat: MVP‑1 World skeleton",
+        "body": f"Closes #{ISSUE_NUMBER} – adds empty World class files.",
+    })
+    if not resp:
+        return None
+    return resp["data"]["createPullRequest"]["pullRequest"]
+
+def add_issue_comment(issue_id, body):
+    """Issue'ya yorum ekler."""
+    return gql(_M_ADD_COMMENT, {"subject": issue_id, "body": body}) is not None
+
+def update_issue(ids, from_cache):
+    """Issue kartını Dev'e taşır; önbellekteki kimlikler eskimişse bir kez yeniden dener."""
+    print(f"ℹ️ Updating issue #{ISSUE_NUMBER}")
+    
+    # Issue'yu projeye ekle/kartını taşı
+    if move_issue_card_to_dev(ISSUE_NUMBER, ids):
+        return
+    # Kimlikler eskimiş olabilir (ör. proje panosu yeniden oluşturuldu)
+    invalidate_json_cache(IDS_CACHE)
+    if not from_cache:
+        return
+    print("ℹ️ Önbellekteki proje kimlikleri geçersiz olabilir, yeniden sorgulanıyor...")
+    try:
+        ids, _ = get_project_ids(ISSUE_NUMBER, refresh=True)
+    except ValueError as e:
+        print(f"❌ Proje bilgileri yeniden alınamadı: {e}")
+        return
+    if not move_issue_card_to_dev(ISSUE_NUMBER, ids):
+        invalidate_json_cache(IDS_CACHE)
+
+def comment_on_issue(ids, pr):
+    """Issue'ya PR bağlantısını yorum olarak ekler."""
+    comment_body = f"PR #{pr['number']} linked."
+    if add_issue_comment(ids["issue_id"], comment_body):
+        print(f"💬 Comment added to issue #{ISSUE_NUMBER}: '{comment_body}'")
+    else:
+        print(f"❌ Error commenting on issue #{ISSUE_NUMBER}")
+
+def send_slack(pr):
+    """PR bağlantısını Slack'e gönderir."""
+    try:
+        print("ℹ️ Sending Slack notification...")
+        # Gövde tek seferde bayt olarak kodlanır; requests'in json= yolu atlanır
+        slack_payload = orjson.dumps({"text": SLACK_TEXT.format(pr=pr["number"], url=pr["url"])})
+        slack_response = SESSION.post(SLACK, data=slack_payload,
+                                      headers={"Content-Type": "application/json"}, timeout=SLACK_TIMEOUT)
+        slack_response.raise_for_status()
+        print("📢  Sent Slack notification")
+    except requests.exceptions.RequestException as e_slack:
+        print(f"⚠️ Error sending Slack notification: {e_slack}")
+    except Exception as e_slack_unexp:
+         print(f"⚠️ Unexpected error sending Slack notification: {type(e_slack_unexp).__name__} - {e_slack_unexp}")
+
 # ---------- Ana iş akışı ----------
 def main():
     """Ana otomasyon adımlarını çalıştırır."""
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="orchestrator") as executor:
+        run(executor)
+
+def run(executor):
+    """Otomasyon adımları; bağımsız çağrılar verilen iş parçacığı havuzunda eşzamanlı çalışır."""
     
-    # 1) Proje, alan ve seçenek bilgilerini al
+    # 1) Proje, alan, seçenek ve issue kimliklerini al; branch durumu aynı anda sorgulanır
+    state_future = executor.submit(fetch_branch_state)
     try:
-        project_id, status_field_id, dev_option_id = fetch_project_and_status_info()
+        ids, ids_from_cache = executor.submit(get_project_ids, ISSUE_NUMBER).result()
     except ValueError as e:
         print(f"❌ Kritik Hata: Proje bilgileri alınamadı: {e}")
         return
@@ -274,97 +384,61 @@ def main():
         traceback.print_exc()
         return
     
+    # Branch, dosyalar ve açık PR'ın mevcut durumu tek sorguda alınır
+    state = state_future.result()
+    if not state:
+        print("❌ Error fetching repository state.")
+        return
+    
     # 2) Branch oluştur veya var olanı kullan
-    try:
-        print(f"ℹ️ Checking/Creating branch: {BRANCH}")
-        main_branch = repo.get_branch("main")
-        main_sha = main_branch.commit.sha
-        repo.create_git_ref(ref=f"refs/heads/{BRANCH}", sha=main_sha)
-        print("🌿  Created branch", BRANCH)
-    except GithubException as e:
-        if e.status == 422 and isinstance(e.data, dict) and "Reference already exists" in e.data.get("message", ""):
-            print("ℹ️  Branch exists; continue")
-        else:
-            print(f"❌ Error creating branch: {e.status} - {e.data}")
+    print(f"ℹ️ Checking/Creating branch: {BRANCH}")
+    head_oid = state["branch_oid"]
+    if head_oid:
+        print("ℹ️  Branch exists; continue")
+    else:
+        if not state["main_oid"]:
+            print("❌ Error creating branch: main branch not found")
             return
-    except Exception as e:
-        print(f"❌ Unexpected error creating branch: {type(e).__name__} - {e}")
-        return
+        head_oid = create_branch(state["repo_id"], state["main_oid"])
+        if not head_oid:
+            print("❌ Error creating branch.")
+            return
+        print("🌿  Created branch", BRANCH)
 
     # 3) Boş dosyaları ekle (varsa atla)
-    files_to_add = ("src/ecs/World.hpp", "src/ecs/World.cpp")
-    print(f"ℹ️ Checking/Adding files: {files_to_add}")
-    files_added_this_run = False
-    for path in files_to_add:
-        try:
-            repo.get_contents(path, ref=BRANCH)
-        except GithubException as e:
-             if e.status == 404: # Dosya yoksa oluştur
-                try:
-                    commit_message = f"feat: add empty {os.path.basename(path)}"
-                    repo.create_file(path, commit_message, "", branch=BRANCH)
-                    print(f"➕  Added file: {path}")
-                    files_added_this_run = True
-                except GithubException as e_create:
-                     print(f"❌ Error adding file {path}: {e_create.status} - {e_create.data}")
-                except Exception as e_create_unexp:
-                     print(f"❌ Unexpected error adding file {path}: {type(e_create_unexp).__name__} - {e_create_unexp}")
-             else:
-                 print(f"❌ Error checking file {path}: {e.status} - {e.data}")
-        except Exception as e_check_unexp:
-            print(f"❌ Unexpected error checking file {path}: {type(e_check_unexp).__name__} - {e_check_unexp}")
+    print(f"ℹ️ Checking/Adding files: {FILES_TO_ADD}")
+    if state["missing_files"]:
+        commit_oid = add_empty_files(state["missing_files"], head_oid)
+        if commit_oid:
+            for path in state["missing_files"]:
+                print(f"➕  Added file: {path}")
+        else:
+            print(f"❌ Error adding files: {state['missing_files']}")
 
     # 4) PR aç / varsa yeniden kullan
-    pr = None
-    try:
-        print(f"ℹ️ Checking/Creating Pull Request from branch {BRANCH} to main")
-        pulls = repo.get_pulls(state="open", head=f"{repo.owner.login}:{BRANCH}", base="main")
-        if pulls.totalCount > 0:
-            pr = pulls[0]
-            print(f"🔗  PR #{pr.number} already exists: {pr.html_url}")
+    print(f"ℹ️ Checking/Creating Pull Request from branch {BRANCH} to main")
+    pr = state["pr"]
+    if pr:
+        print(f"🔗  PR #{pr['number']} already exists: {pr['url']}")
+    else:
+        pr = create_pull_request(state["repo_id"])
+        if pr:
+            print(f"🔗  PR #{pr['number']} opened: {pr['url']}")
         else:
-            pr_title = "feat: MVP‑1 World skeleton"
-            pr_body = f"Closes #{ISSUE_NUMBER} – adds empty World class files."
-            pr = repo.create_pull(title=pr_title, body=pr_body, base="main", head=BRANCH)
-            print(f"🔗  PR #{pr.number} opened: {pr.html_url}")
-    except GithubException as e_pr:
-        print(f"❌ Error getting or creating PR: {e_pr.status} - {e_pr.data}")
-    except Exception as e_pr_unexp:
-        print(f"❌ Unexpected error with PR: {type(e_pr_unexp).__name__} - {e_pr_unexp}")
+            print("❌ Error creating PR.")
 
     if not pr:
         print("⚠️ Skipping issue update and Slack notification because PR is not available.")
         return
 
-    # 5) Issue'u Dev'e taşı ve yorum ekle
-    try:
-        print(f"ℹ️ Updating issue #{ISSUE_NUMBER}")
-        
-        # Issue'yu projeye ekle/kartını taşı
-        move_issue_card_to_dev(ISSUE_NUMBER, project_id, status_field_id, dev_option_id)
-        
-        # Issue'ya yorum ekle
-        issue = repo.get_issue(ISSUE_NUMBER)
-        comment_body = f"PR #{pr.number} linked."
-        issue.create_comment(comment_body)
-        print(f"💬 Comment added to issue #{ISSUE_NUMBER}: '{comment_body}'")
-
-    except GithubException as e_issue:
-         print(f"❌ Error interacting with issue #{ISSUE_NUMBER}: {e_issue.status} - {e_issue.data}")
-    except Exception as e_issue_unexp:
-        print(f"❌ Unexpected error interacting with issue #{ISSUE_NUMBER}: {type(e_issue_unexp).__name__} - {e_issue_unexp}")
-
-    # 6) Slack ping
-    try:
-        print("ℹ️ Sending Slack notification...")
-        slack_payload = {"text": SLACK_TEXT.format(pr=pr.number, url=pr.html_url)}
-        slack_response = requests.post(SLACK, json=slack_payload, timeout=10)
-        slack_response.raise_for_status()
-        print("📢  Sent Slack notification")
-    except requests.exceptions.RequestException as e_slack:
-        print(f"⚠️ Error sending Slack notification: {e_slack}")
-    except Exception as e_slack_unexp:
-         print(f"⚠️ Unexpected error sending Slack notification: {type(e_slack_unexp).__name__} - {e_slack_unexp}")
+    # 5) Issue'u Dev'e taşı ve yorum ekle, 6) Slack ping — üçü birbirinden bağımsız
+    futures = [
+        executor.submit(update_issue, ids, ids_from_cache),
+        executor.submit(comment_on_issue, ids, pr),
+        executor.submit(send_slack, pr),
+    ]
+    for future in futures:
+        future.result()
 
 
 if __name__ == "__main__":
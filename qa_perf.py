@@ -9,28 +9,79 @@ SimplyECS – QA/Perf AI
 
 import os
 import sys
-import json
-import yaml
+import hashlib
+import textwrap
 import requests
-import time
-from github import Github, GithubException
+from concurrent.futures import ThreadPoolExecutor
 import openai
+from crew_common import (GitHubAPIError, commit_files, fetch_blobs, gh_get, gh_post, list_pr_files,
+                         load_config, load_json_cache, post_slack, save_json_cache, stream_text)
 
 # ---------- Ayarlar ----------
 REPO_FULL = "halitipek/ai-crew-sandbox"
+REPO_PATH = f"/repos/{REPO_FULL}"
+# Aynı anda çalışacak en fazla OpenAI üretim çağrısı (API hız limitleri için)
+MAX_PARALLEL_GENERATIONS = 4
+# Kod analizleri, gönderilen prompt'un özetiyle .cache altında saklanır
+ANALYSIS_CACHE_DIR = "qa_analysis"
+# Dosya uzantısından PR dosya grubuna eşleme
+_EXT_GROUPS = {
+    "cpp": "cpp", "cc": "cpp", "cxx": "cpp",
+    "hpp": "hpp", "h": "hpp", "hxx": "hpp",
+    "inl": "inl",
+    "cmake": "cmake",
+}
 
 # Config'den model bilgilerini oku
-def load_config():
-    try:
-        with open('crew_config.yaml', 'r') as file:
-            config = yaml.safe_load(file)
-            return config.get('crew', {})
-    except Exception as e:
-        print(f"❌ Config dosyası okunamadı: {str(e)}")
-        return {}
-
 CONFIG = load_config()
 QA_PERF_MODEL = CONFIG.get('qa_perf', {}).get('model', 'gpt-3.5-turbo-0125')
+# Kod analizi bir özetleme işidir ve üretimi bekletir; ayrı (daha küçük) bir model seçilebilir
+QA_PERF_ANALYZE_MODEL = CONFIG.get('qa_perf', {}).get('analyze_model', QA_PERF_MODEL)
+# Deterministik çıktı sağlayıcı önbelleğini de daha iyi kullanır; değer config'den
+# okunur. Config'de yoksa 0 kullanılır; yalnızca varsayılan sıcaklığı (1) kabul eden
+# akıl yürütme modellerinde (o1/o3/o4...) varsayılan 1'dir.
+QA_PERF_TEMPERATURE = CONFIG.get('qa_perf', {}).get('temperature', 1 if QA_PERF_MODEL.startswith('o') else 0)
+# Header token sayısı karakter sayısından bu oranla tahmin edilir
+CHARS_PER_TOKEN = 4
+# Test kodu, test ettiği header'ın yaklaşık bu kadar katı uzunlukta beklenir
+TEST_TOKENS_PER_HEADER_TOKEN = 4
+# Test üretimi bütçesinin alt ve üst sınırları
+MIN_TEST_TOKENS = 1200
+MAX_TEST_TOKENS = 3000
+
+# Üretim yönergeleri; her çağrıda bayt bayt aynı gönderilir ki sağlayıcı
+# tarafındaki prompt önbelleği (ortak önek) devreye girsin
+TEST_SYSTEM_PROMPT = textwrap.dedent("""
+        Sen bir C++ kütüphanesi geliştiren takımın QA uzmanısın. 
+        SimplyECS (Entity Component System) kütüphanesi için unit testler yazıyorsun.
+        
+        Aşağıdaki kriterlere göre test kodu yazmalısın:
+        
+        1. GoogleTest kütüphanesini kullan
+        2. Kapsamlı test senaryoları oluştur
+        3. Edge case'leri test et
+        4. Anlaşılır test isimleri ve açıklamaları kullan
+        5. Test öncesi kurulum ve sonrası temizlik kodlarını ekle
+        
+        İstenen görev ve detayları dikkatlice oku, belirtilen C++ koduna uygun testler üret.
+        """).strip()
+
+BENCHMARK_SYSTEM_PROMPT = textwrap.dedent("""
+        Sen bir C++ kütüphanesi geliştiren takımın performans uzmanısın. 
+        SimplyECS (Entity Component System) kütüphanesi için benchmark kodları yazıyorsun.
+        
+        Aşağıdaki kriterlere göre benchmark kodu yazmalısın:
+        
+        1. Doğru ve tutarlı ölçümler yap
+        2. Mikro ve makro benchmarkları içer
+        3. Farklı veri büyüklüklerini test et (1K, 10K, 100K, 1M entity)
+        4. Sonuçları okunabilir bir formatta raporla
+        5. Hedef performansla karşılaştır (1M entity <= 20 ms)
+        
+        İstenen görev ve detayları dikkatlice oku, belirtilen C++ koduna uygun benchmarklar üret.
+        """).strip()
+
+ANALYSIS_SYSTEM_PROMPT = "Sen bir kod analizi yapan QA uzmanısın."
 
 # Ortam değişkenlerini kontrol et
 TOKEN = os.environ.get("GH_PAT")
@@ -53,34 +104,34 @@ if not PR_NUMBER:
     sys.exit(1)
 
 # API'leri yapılandır
-gh = Github(TOKEN)
-repo = gh.get_repo(REPO_FULL)
 openai.api_key = OPENAI_API_KEY
 
 # ---------- Yardımcı Fonksiyonlar ----------
 def notify_slack(message):
     """Slack'e bildirim gönderir."""
-    try:
-        payload = {"text": message}
-        response = requests.post(SLACK_WEBHOOK, json=payload, timeout=10)
-        response.raise_for_status()
-        return True
-    except requests.exceptions.RequestException as e:
-        print(f"⚠️ Slack bildirimi gönderilemedi: {e}")
-        return False
+    # Bildirim arka planda gönderilir; çıkışta tamamlanması beklenir
+    post_slack(SLACK_WEBHOOK, message)
+    return True
 
 def get_pr(pr_number):
     """PR nesnesini getirir."""
     try:
-        return repo.get_pull(int(pr_number))
-    except GithubException as e:
+        return gh_get(f"{REPO_PATH}/pulls/{int(pr_number)}")
+    except GitHubAPIError as e:
         print(f"❌ PR alınırken hata oluştu: {e.status} - {e.data}")
         return None
+    except requests.exceptions.RequestException as e:
+        print(f"❌ PR alınırken bağlantı hatası: {e}")
+        return None
 
 def get_pr_files(pr):
     """PR'daki dosyaları alır ve dosya türlerine göre gruplanır."""
     try:
-        files = list(pr.get_files())
+        # Dosya listesi tek GraphQL sorgusuyla, sayfa başına 100 dosya olarak alınır
+        listing = list_pr_files(REPO_FULL, pr["number"])
+        if listing is None:
+            return None
+        _, files = listing
         
         # Dosyaları türlerine göre grupla
         grouped_files = {
@@ -94,132 +145,99 @@ def get_pr_files(pr):
         }
         
         for file in files:
-            path = file.filename
-            ext = path.split('.')[-1].lower()
+            path = file["path"]
+            lower_path = path.lower()
             
-            if "test" in path.lower() or path.startswith("tests/"):
+            # "tests/" ile başlayan yollar zaten "test" içerir
+            if "test" in lower_path:
                 grouped_files["tests"].append(path)
-            elif "benchmark" in path.lower():
+            elif "benchmark" in lower_path:
                 grouped_files["benchmark"].append(path)
-            elif ext == "cpp" or ext == "cc" or ext == "cxx":
-                grouped_files["cpp"].append(path)
-            elif ext == "hpp" or ext == "h" or ext == "hxx":
-                grouped_files["hpp"].append(path)
-            elif ext == "inl":
-                grouped_files["inl"].append(path)
-            elif path == "CMakeLists.txt" or path.endswith(".cmake"):
+            elif path == "CMakeLists.txt":
                 grouped_files["cmake"].append(path)
             else:
-                grouped_files["other"].append(path)
+                group = _EXT_GROUPS.get(lower_path.rpartition('.')[2], "other")
+                grouped_files[group].append(path)
                 
         return grouped_files
-    except GithubException as e:
-        print(f"❌ PR dosyaları alınırken hata oluştu: {e.status} - {e.data}")
+    except (KeyError, TypeError) as e:
+        print(f"❌ PR dosyaları alınırken hata oluştu: {e}")
         return None
 
-def get_file_content(pr, file_path):
-    """PR'da belirtilen dosya yolundaki içeriği getirir."""
-    try:
-        content = repo.get_contents(file_path, ref=pr.head.ref)
-        return content.decoded_content.decode('utf-8')
-    except Exception as e:
-        print(f"⚠️ Dosya içeriği alınamadı {file_path}: {e}")
-        return None
+def estimated_tokens(text):
+    """Metnin yaklaşık token sayısını karakter sayısından tahmin eder."""
+    return len(text) // CHARS_PER_TOKEN
 
-def update_file(pr, file_path, content, commit_message):
-    """Belirtilen dosyayı günceller veya oluşturur."""
-    try:
-        # Önce dosyanın mevcut içeriğini ve SHA'sını almaya çalış
-        try:
-            file_content = repo.get_contents(file_path, ref=pr.head.ref)
-            sha = file_content.sha
-            # Dosya var, güncelle
-            repo.update_file(file_path, commit_message, content, sha, branch=pr.head.ref)
-            print(f"✅ Dosya güncellendi: {file_path}")
-        except:
-            # Dosya yok, oluştur
-            repo.create_file(file_path, commit_message, content, branch=pr.head.ref)
-            print(f"✅ Dosya oluşturuldu: {file_path}")
-        
-        return True
-    except Exception as e:
-        print(f"❌ Dosya güncellenirken/oluşturulurken hata: {str(e)}")
-        return False
+def test_token_budget(header_content):
+    """Header'ın tahmini token sayısının TEST_TOKENS_PER_HEADER_TOKEN katını döndürür.
+
+    Büyük header'larda bütçe MAX_TEST_TOKENS ile kırpılır. Küçük (ya da okunamayan)
+    header'lar da en az MIN_TEST_TOKENS alır; birkaç satırlık bir header için bile
+    test dosyasının iskeleti ve include'ları bu kadar yer tutar.
+    """
+    budget = TEST_TOKENS_PER_HEADER_TOKEN * estimated_tokens(header_content)
+    return max(MIN_TEST_TOKENS, min(MAX_TEST_TOKENS, budget))
 
-def generate_tests(prompt):
-    """AI modeli kullanarak test kodu üretir."""
+def generate_tests(context, prompt, max_completion_tokens=MAX_TEST_TOKENS):
+    """AI modeli kullanarak test kodu üretir.
+
+    `context` tüm çağrılarda aynı olan kod ve analiz bloğudur; dosyaya özgü
+    `prompt`'tan önce gönderilir ki ilk çağrıdan sonraki test üretimleri ortak
+    öneki sağlayıcı önbelleğinden okusun (bkz. process_pr).
+    """
     try:
-        system_message = """
-        Sen bir C++ kütüphanesi geliştiren takımın QA uzmanısın. 
-        SimplyECS (Entity Component System) kütüphanesi için unit testler yazıyorsun.
-        
-        Aşağıdaki kriterlere göre test kodu yazmalısın:
-        
-        1. GoogleTest kütüphanesini kullan
-        2. Kapsamlı test senaryoları oluştur
-        3. Edge case'leri test et
-        4. Anlaşılır test isimleri ve açıklamaları kullan
-        5. Test öncesi kurulum ve sonrası temizlik kodlarını ekle
-        
-        İstenen görev ve detayları dikkatlice oku, belirtilen C++ koduna uygun testler üret.
-        """
-        
-        response = openai.chat.completions.create(
+        stream = openai.chat.completions.create(
             model=QA_PERF_MODEL,
             messages=[
-                {"role": "system", "content": system_message},
+                {"role": "system", "content": TEST_SYSTEM_PROMPT},
+                {"role": "user", "content": context},
                 {"role": "user", "content": prompt}
             ],
-            temperature=1,
-            max_completion_tokens=3000
+            temperature=QA_PERF_TEMPERATURE,
+            max_completion_tokens=max_completion_tokens,
+            stream=True
         )
         
-        return response.choices[0].message.content
+        return stream_text(stream)
     
     except Exception as e:
         print(f"❌ AI test üretimi sırasında hata oluştu: {str(e)}")
         return None
 
-def generate_benchmark(prompt):
-    """AI modeli kullanarak benchmark kodu üretir."""
+def generate_benchmark(context, prompt):
+    """AI modeli kullanarak benchmark kodu üretir; `context` generate_tests ile aynıdır."""
     try:
-        system_message = """
-        Sen bir C++ kütüphanesi geliştiren takımın performans uzmanısın. 
-        SimplyECS (Entity Component System) kütüphanesi için benchmark kodları yazıyorsun.
-        
-        Aşağıdaki kriterlere göre benchmark kodu yazmalısın:
-        
-        1. Doğru ve tutarlı ölçümler yap
-        2. Mikro ve makro benchmarkları içer
-        3. Farklı veri büyüklüklerini test et (1K, 10K, 100K, 1M entity)
-        4. Sonuçları okunabilir bir formatta raporla
-        5. Hedef performansla karşılaştır (1M entity <= 20 ms)
-        
-        İstenen görev ve detayları dikkatlice oku, belirtilen C++ koduna uygun benchmarklar üret.
-        """
-        
-        response = openai.chat.completions.create(
+        stream = openai.chat.completions.create(
             model=QA_PERF_MODEL,
             messages=[
-                {"role": "system", "content": system_message},
+                {"role": "system", "content": BENCHMARK_SYSTEM_PROMPT},
+                {"role": "user", "content": context},
                 {"role": "user", "content": prompt}
             ],
-            temperature=1,
-            max_completion_tokens=3000
+            temperature=QA_PERF_TEMPERATURE,
+            max_completion_tokens=3000,
+            stream=True
         )
         
-        return response.choices[0].message.content
+        return stream_text(stream)
     
     except Exception as e:
         print(f"❌ AI benchmark üretimi sırasında hata oluştu: {str(e)}")
         return None
 
-def analyze_code(file_contents):
-    """Kodu analiz ederek test ve benchmark ihtiyaçlarını belirler."""
+def format_code_files(code_files):
+    """Kod dosyalarını prompt'larda kullanılan "Dosya: yol + kod bloğu" biçimine getirir."""
+    return "\n\n".join(f"Dosya: {path}\n```cpp\n{content}\n```" for path, content in code_files.items())
+
+def analyze_code(code_content):
+    """Kodu analiz ederek test ve benchmark ihtiyaçlarını belirler.
+
+    `code_content` format_code_files çıktısıdır; aynı metin üretim prompt'larında da kullanılır.
+
+    Aynı kod, model ve yönergeyle yapılmış bir analiz önbellekteyse OpenAI'ye
+    gidilmez; PR'a yeni commit gelip kod dosyaları değişmediyse analiz tekrar kullanılır.
+    """
     try:
-        code_content = "\n\n".join([f"Dosya: {path}\n```cpp\n{content}\n```" 
-                                  for path, content in file_contents.items()])
-        
         prompt = f"""
         Aşağıdaki C++ kodlarını analiz et ve test/benchmark ihtiyaçlarını belirle:
         
@@ -233,17 +251,28 @@ def analyze_code(file_contents):
         5. Hangi benchmark metrikleri ölçülmeli?
         """
         
-        response = openai.chat.completions.create(
-            model=QA_PERF_MODEL,
+        key = hashlib.sha256(f"{QA_PERF_ANALYZE_MODEL}\0{ANALYSIS_SYSTEM_PROMPT}\0{prompt}".encode('utf-8')).hexdigest()
+        cache_name = f"{ANALYSIS_CACHE_DIR}/{key}.json"
+        cached = load_json_cache(cache_name)
+        if cached and cached.get("analysis"):
+            print("ℹ️ Kod analizi önbellekten okundu.")
+            return cached["analysis"]
+        
+        stream = openai.chat.completions.create(
+            model=QA_PERF_ANALYZE_MODEL,
             messages=[
-                {"role": "system", "content": "Sen bir kod analizi yapan QA uzmanısın."},
+                {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
-            temperature=1,
-            max_completion_tokens=2000
+            temperature=QA_PERF_TEMPERATURE,
+            max_completion_tokens=2000,
+            stream=True
         )
         
-        return response.choices[0].message.content
+        analysis = stream_text(stream)
+        if analysis:
+            save_json_cache(cache_name, {"model": QA_PERF_ANALYZE_MODEL, "analysis": analysis})
+        return analysis
     
     except Exception as e:
         print(f"❌ Kod analizi sırasında hata oluştu: {str(e)}")
@@ -258,11 +287,11 @@ def process_pr():
             return False
         
         # PR'ın durumunu kontrol et
-        if pr.state != "open":
-            print(f"⚠️ PR #{PR_NUMBER} açık değil, durumu: {pr.state}")
+        if pr["state"] != "open":
+            print(f"⚠️ PR #{PR_NUMBER} açık değil, durumu: {pr['state']}")
             return False
         
-        print(f"ℹ️ PR #{PR_NUMBER} inceleniyor: {pr.title}")
+        print(f"ℹ️ PR #{PR_NUMBER} inceleniyor: {pr['title']}")
         
         # PR'daki dosyaları grupla
         file_groups = get_pr_files(pr)
@@ -270,22 +299,30 @@ def process_pr():
             print("❌ PR dosyaları alınamadı.")
             return False
         
-        # Kod dosyalarını oku
-        code_files = {}
-        for file_type in ["cpp", "hpp", "inl"]:
-            for file_path in file_groups[file_type]:
-                content = get_file_content(pr, file_path)
-                if content:
-                    code_files[file_path] = content
+        # Kod dosyası yoksa (ör. yalnızca doküman değişikliği) içerik ve AI çağrısı yapma
+        code_paths = [path for file_type in ("cpp", "hpp", "inl") for path in file_groups[file_type]]
+        if not code_paths:
+            print("⚠️ PR'da kod dosyası bulunamadı.")
+            return False
+        
+        # Kod dosyalarını oku; tüm içerikler head commit'ten tek sorguda gelir
+        contents = fetch_blobs(REPO_FULL, pr["head"]["sha"], code_paths)
+        if contents is None:
+            print("❌ Kod dosyalarının içerikleri alınamadı.")
+            return False
+        code_files = {path: contents[path] for path in code_paths if contents.get(path)}
         
         if not code_files:
-            print("⚠️ PR'da kod dosyası bulunamadı.")
+            print("⚠️ PR'daki kod dosyalarının içeriği alınamadı.")
             return False
         
         print(f"📋 {len(code_files)} kod dosyası bulundu.")
         
+        # Kod metni bir kez biçimlenir; analiz ve üretim prompt'ları aynı metni kullanır
+        formatted_code_files = format_code_files(code_files)
+        
         # Kodu analiz et
-        code_analysis = analyze_code(code_files)
+        code_analysis = analyze_code(formatted_code_files)
         if not code_analysis:
             print("❌ Kod analizi başarısız oldu.")
             return False
@@ -293,11 +330,23 @@ def process_pr():
         print("✅ Kod analizi tamamlandı.")
         print(code_analysis)
         
+        # Kodlar ve analiz tüm üretim çağrılarında aynı metinle, değişen kısımdan önce
+        # gönderilir; böylece her header için yalnızca kısa son mesaj farklı olur
+        code_context = f"""
+        Kod dosyaları:
+        
+        {formatted_code_files}
+        
+        Kod analizi:
+        {code_analysis}
+        """
+        
         # Test ve benchmark dosyaları oluştur
         generated_files = []
         
         # Unit testler oluştur
         # Her .hpp dosyası için bir test dosyası oluştur
+        test_jobs = []
         for hpp_file in file_groups["hpp"]:
             base_name = os.path.basename(hpp_file).split('.')[0]
             test_file_path = f"tests/{base_name}Tests.cpp"
@@ -315,48 +364,21 @@ def process_pr():
             
             # Test kodu üret
             test_prompt = f"""
-            Aşağıdaki C++ header dosyası için kapsamlı unit testler yaz:
+            Yukarıdaki kodlar arasındaki şu C++ header dosyası için kapsamlı unit testler yaz:
             
             Header dosyası: {hpp_file}
-            ```cpp
-            {code_files.get(hpp_file, "// Dosya içeriği alınamadı")}
-            ```
-            
-            Kod analizi:
-            {code_analysis}
             
             Test dosyası: {test_file_path}
             GoogleTest kullanarak testleri yaz.
             """
-            
-            test_code = generate_tests(test_prompt)
-            if not test_code:
-                print(f"❌ Test kodu üretimi başarısız oldu: {test_file_path}")
-                continue
-            
-            # Test dosyasını oluştur
-            commit_message = f"test: add unit tests for {base_name}"
-            update_result = update_file(pr, test_file_path, test_code, commit_message)
-            
-            if update_result:
-                print(f"✅ Test dosyası oluşturuldu: {test_file_path}")
-                generated_files.append(test_file_path)
+            test_jobs.append((test_file_path, test_prompt, test_token_budget(code_files.get(hpp_file, ""))))
         
         # Benchmark dosyası oluştur
         benchmark_file_path = "src/benchmark/ClassBenchmark.cpp"
         
-        # Format code files string separately to avoid backslash in f-string expression
-        formatted_code_files = chr(10).join([f"Dosya: {path}\n```cpp\n{content}\n```"
-                                                for path, content in code_files.items()])
-
         # Benchmark kodu üret
         benchmark_prompt = f"""
-        Aşağıdaki C++ kodları için benchmark testleri yaz:
-        
-        {formatted_code_files}
-        
-        Kod analizi:
-        {code_analysis}
+        Yukarıdaki C++ kodları için benchmark testleri yaz:
         
         Benchmark dosyası: {benchmark_file_path}
         
@@ -367,15 +389,46 @@ def process_pr():
         Benchmark sonuçlarını konsola yazdır ve geçti/kaldı durumunu raporla.
         """
         
-        benchmark_code = generate_benchmark(benchmark_prompt)
-        if benchmark_code:
-            # Benchmark dosyasını oluştur
-            commit_message = "bench: add performance benchmark"
-            update_result = update_file(pr, benchmark_file_path, benchmark_code, commit_message)
+        # Test ve benchmark üretimleri birbirinden bağımsızdır ve aynı anda çalışır.
+        # Test çağrılarının ortak öneki (yönerge + code_context) sağlayıcı önbelleğine
+        # ancak ilk yanıt tamamlanınca yazılır; bu yüzden ilk test bitmeden diğerleri
+        # gönderilmez. Benchmark'ın yönergesi farklı olduğundan beklemesine gerek yoktur.
+        generated = {}
+        workers = min(MAX_PARALLEL_GENERATIONS, len(test_jobs) + 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="qa-gen") as executor:
+            benchmark_future = executor.submit(generate_benchmark, code_context, benchmark_prompt)
+            test_futures = []
+            for i, (_, prompt, budget) in enumerate(test_jobs):
+                test_futures.append(executor.submit(generate_tests, code_context, prompt, budget))
+                if i == 0:
+                    test_futures[0].result()
             
-            if update_result:
-                print(f"✅ Benchmark dosyası oluşturuldu: {benchmark_file_path}")
-                generated_files.append(benchmark_file_path)
+            for (test_file_path, _, _), future in zip(test_jobs, test_futures):
+                test_code = future.result()
+                if not test_code:
+                    print(f"❌ Test kodu üretimi başarısız oldu: {test_file_path}")
+                    continue
+                generated[test_file_path] = test_code
+            
+            benchmark_code = benchmark_future.result()
+        
+        if benchmark_code:
+            generated[benchmark_file_path] = benchmark_code
+        else:
+            print(f"❌ Benchmark kodu üretimi başarısız oldu: {benchmark_file_path}")
+        
+        # Tüm test ve benchmark dosyalarını tek bir commit ile branch'e yaz
+        if generated:
+            commit_message = "test: add " + ", ".join(os.path.basename(path) for path in generated)
+            try:
+                commit_sha = commit_files(REPO_FULL, pr["head"]["ref"], generated, commit_message,
+                                          head_sha=pr["head"]["sha"])
+                print(f"✅ {len(generated)} dosya tek commit ile oluşturuldu: {commit_sha[:7]}")
+                generated_files.extend(generated)
+            except GitHubAPIError as e:
+                print(f"❌ Dosyalar commit edilirken hata: {e.status} - {e.data}")
+            except requests.exceptions.RequestException as e:
+                print(f"❌ Dosyalar commit edilirken bağlantı hatası: {e}")
         
         # İşlem tamamlandı, PR'a yorum ekle
         comment = f"""
@@ -398,7 +451,7 @@ def process_pr():
         CI pipeline çalıştırıldığında test ve benchmark sonuçları kontrol edilecek.
         """
         
-        pr.create_issue_comment(comment)
+        gh_post(f"{REPO_PATH}/issues/{pr['number']}/comments", {"body": comment})
         
         # Slack'e bildirim gönder
         notify_slack(f":test_tube: QA/Perf, PR #{PR_NUMBER} için test ve benchmark dosyalarını oluşturdu!")